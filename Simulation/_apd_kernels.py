@@ -0,0 +1,36 @@
+"""
+Simulation/_apd_kernels.py
+Compiled kernels for the APD detector model.
+Holds the loop-carried parts of APD_Detector.detect_batch that cannot be
+expressed as whole-array NumPy operations.
+"""
+__author__ = "Rahul Rajesh 2360445"
+
+import numpy as np
+from numpy.typing import NDArray
+
+from _jit import njit
+
+
+@njit(cache=True)
+def apply_dead_time(
+    times: NDArray[np.float64],
+    candidate_fire: NDArray[np.bool_],
+    dead_time: float,
+    last_t0: float,
+) -> tuple[NDArray[np.bool_], float]:
+    """
+    Sequential dead-time scan over a pulse train.
+
+    Returns a boolean `alive` array (pulse arrived outside the dead window of
+    the previous click) and the time of the last click. A pulse only fires if
+    it is both alive and a candidate, and only fired pulses restart the window.
+    """
+    alive = np.zeros(times.shape[0], dtype=np.bool_)
+    last  = last_t0
+    for i in range(times.shape[0]):
+        if times[i] - last >= dead_time:
+            alive[i] = True
+            if candidate_fire[i]:
+                last = times[i]
+    return alive, last
@@ -0,0 +1,114 @@
+"""
+Simulation/_bb84_kernels.py
+Compiled kernels for the vectorized BB84 engine.
+Each kernel fuses a chain of whole-array NumPy operations into a single pass
+over the qubits, so no N-sized temporaries are materialised. Callers keep the
+NumPy expression as the fallback when NUMBA_AVAILABLE is False.
+"""
+__author__ = "Rahul Rajesh 2360445"
+
+import numpy as np
+from numpy.typing import NDArray
+
+from _jit import njit
+
+
+@njit(fastmath=True, cache=True)
+def prepare_states(
+    bits: NDArray[np.uint8],
+    bases: NDArray[np.uint8],
+    out0: NDArray[np.floating],
+    out1: NDArray[np.floating],
+) -> None:
+    """
+    Write Alice's encoded amplitudes in one pass over the qubits.
+
+    Rectilinear qubits are |0⟩ = (1, 0) or |1⟩ = (0, 1); diagonal qubits get
+    the Hadamard image (a + b, a − b)/√2, i.e. (K, K) or (K, −K).
+    """
+    k = 0.7071067811865476
+    for i in range(bits.shape[0]):
+        b = bits[i]
+        if bases[i] == 1:
+            out0[i] = k
+            out1[i] = k if b == 0 else -k
+        else:
+            out0[i] = 1.0 - b
+            out1[i] = b
+
+
+@njit(fastmath=True, cache=True)
+def measure_born(
+    s0: NDArray[np.floating],
+    s1: NDArray[np.floating],
+    bases: NDArray[np.uint8],
+    u: NDArray[np.floating],
+    out: NDArray[np.uint8],
+) -> NDArray[np.uint8]:
+    """
+    Fused Born-rule measurement of real amplitudes (s0, s1).
+
+    Diagonal-basis qubits use the |D⟩ amplitude (s0 + s1)/√2, rectilinear
+    qubits the |H⟩ amplitude s0; the outcome is 0 when u < |amplitude|².
+    Outcomes are written into the preallocated `out`, which is returned.
+    """
+    n = s0.shape[0]
+    for i in range(n):
+        if bases[i] == 1:
+            a = 0.7071067811865476 * (s0[i] + s1[i])
+        else:
+            a = s0[i]
+        out[i] = 0 if u[i] < a * a else 1
+    return out
+
+
+@njit(cache=True)
+def batch_rounds(
+    n_qubits: int,
+    seeds: NDArray[np.int64],
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """
+    Noiseless BB84 rounds, one per seed, as a scalar loop per run.
+
+    Each qubit takes one [0, 4) draw whose two bits are Alice's and Bob's
+    bases; only the basis-match count accumulates, in a local, so no
+    per-qubit arrays exist at all. Every run is reseeded from `seeds`, so a
+    run's result depends only on its seed.
+    """
+    n_runs = seeds.shape[0]
+    # A noiseless channel has QBER 0 by construction
+    qber = np.zeros(n_runs)
+    sifted = np.zeros(n_runs, dtype=np.int64)
+    for r in range(n_runs):
+        np.random.seed(seeds[r])
+        matches = 0
+        for _ in range(n_qubits):
+            d = np.random.randint(0, 4)
+            if d & 1 == (d >> 1) & 1:
+                matches += 1
+        sifted[r] = matches
+    return qber, sifted
+
+
+@njit(fastmath=True, cache=True)
+def measure_born_noisy(
+    s0: NDArray[np.floating],
+    s1: NDArray[np.floating],
+    bases: NDArray[np.uint8],
+    u_fail: NDArray[np.floating],
+    p_fail: float,
+    u: NDArray[np.floating],
+    out: NDArray[np.uint8],
+) -> NDArray[np.uint8]:
+    """
+    measure_born with a faulty diagonal polariser: a diagonal-basis qubit is
+    measured in the rectilinear basis instead when u_fail < p_fail.
+    """
+    n = s0.shape[0]
+    for i in range(n):
+        if bases[i] == 1 and u_fail[i] >= p_fail:
+            a = 0.7071067811865476 * (s0[i] + s1[i])
+        else:
+            a = s0[i]
+        out[i] = 0 if u[i] < a * a else 1
+    return out
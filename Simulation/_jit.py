@@ -0,0 +1,21 @@
+"""
+Simulation/_jit.py
+Optional Numba support for the simulation kernels.
+Exposes `njit` and `prange`. When Numba is not installed, `njit` degrades to
+a no-op decorator and `prange` to the builtin range, so every kernel still
+runs as plain Python and callers can branch on NUMBA_AVAILABLE.
+"""
+__author__ = "Rahul Rajesh 2360445"
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """Identity decorator used in place of numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
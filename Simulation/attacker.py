@@ -4,29 +4,34 @@ import numpy as np
 import core as bb
 from manager import QKDExperiment
 
+_K = bb.H_GATE[0, 0]
+
 class Eve(bb.Bob):
-    def __init__(self, n_qubits):
-        super().__init__(n_qubits)
-        self.reprepared_states = None
+    def __init__(self, n_qubits, rng=None):
+        super().__init__(n_qubits, rng)
+        self.reprepared_states = np.empty((2, n_qubits), dtype=bb.AMP_DTYPE)
 
     def intercept_and_resend(self, state_matrix):
         self.measure_qubits(state_matrix)
-        
-        self.reprepared_states = np.zeros((2, self.n))
-        
-        self.reprepared_states[0, :] = (self.measured_bits == 0).astype(float)
-        self.reprepared_states[1, :] = (self.measured_bits == 1).astype(float)
-        
-        diag_indices = np.where(self.bases == 1)[0]
-        if len(diag_indices) > 0:
-            states_to_rotate = self.reprepared_states[:, diag_indices]
-            self.reprepared_states[:, diag_indices] = bb.H_GATE @ states_to_rotate
-            
+
+        # Re-prepared amplitudes in closed form:
+        #   rectilinear -> (1 - b, b)      diagonal -> (K, K * (1 - 2b))
+        # written in place into the buffer allocated once in __init__
+        b = self.measured_bits
+        is_diag = self.bases == 1
+        row0, row1 = self.reprepared_states
+
+        np.subtract(1.0, b, out=row0)
+        np.subtract(row0, b, out=row1)
+        row1 *= _K
+        np.copyto(row1, b, where=~is_diag)
+        np.copyto(row0, _K, where=is_diag)
+
         return self.reprepared_states
 
 class EveQuantumChannel(bb.QuantumChannel):
-    def __init__(self, n_qubits):
-        self.eve = Eve(n_qubits)
+    def __init__(self, n_qubits, rng=None):
+        self.eve = Eve(n_qubits, rng)
         
     def transmit(self, state_matrix):
         return self.eve.intercept_and_resend(state_matrix)
@@ -34,4 +39,4 @@ class EveQuantumChannel(bb.QuantumChannel):
 class EveQKDExperiment(QKDExperiment):
     def build_phase(self):
         super().build_phase()
-        self.q_channel = EveQuantumChannel(self.n)
\ No newline at end of file
+        self.q_channel = EveQuantumChannel(self.n, self.rng)
\ No newline at end of file
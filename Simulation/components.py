@@ -8,8 +8,12 @@ Simulates:
 """
 __author__ = "Rahul Rajesh 2360445"
 
+from collections.abc import Callable, Sequence
+
 import numpy as np
+from numpy.typing import NDArray
 import core_real as phys
+from _apd_kernels import apply_dead_time
 
 # ---------------------------------------------------------------------------
 # Physical constants for the APD model
@@ -21,6 +25,66 @@ CONSTANTS: dict[str, float] = {
     'jitter_attack_ns': 0.050,  # Time-Shift attack jitter std-dev (ns)
 }
 
+# Scalar copies for the single-pulse detect() hot path (no dict lookups)
+_DEAD_TIME:     float = CONSTANTS['dead_time']
+_DARK_PROB:     float = CONSTANTS['dark_count_prob']
+_JITTER_ATTACK: float = CONSTANTS['jitter_attack_ns']
+_FLIP_PROB:     float = 0.005   # rare detector bit-flip (misread) rate
+
+# ---------------------------------------------------------------------------
+# Per-branch telemetry tables for APD_Detector.detect_batch
+# Branch order: dark count, blinding, time-shift, zero-day, normal
+# ---------------------------------------------------------------------------
+_BRANCH_DARK, _BRANCH_BLINDING, _BRANCH_TIMESHIFT, _BRANCH_ZERODAY, _BRANCH_NORMAL = range(5)
+
+_VOLTAGE_MU:    NDArray[np.float64] = np.array([3.3, 9.0,  3.3, 6.5, 3.3])
+_VOLTAGE_SIGMA: NDArray[np.float64] = np.array([0.2, 0.05, 0.2, 0.1, 0.2])
+_JITTER_MU:     NDArray[np.float64] = np.array([1.2, 0.1,  CONSTANTS['jitter_attack_ns'], 2.8, 1.2])
+_JITTER_SIGMA:  NDArray[np.float64] = np.array([0.5, 0.01, 0.01, 0.1, 0.2])
+
+# ---------------------------------------------------------------------------
+# LaserSource intensity modes → photon flux (unknown modes fall back to
+# single-photon). Integer codes index _FLUX_BY_CODE for batched emission.
+# ---------------------------------------------------------------------------
+_FLUX: dict[str, float] = {
+    'single_photon': 0.1,
+    'blinding':      1e9,    # exceeds APD saturation limit → linear mode
+}
+_MODE_CODE:    dict[str, int]      = {mode: code for code, mode in enumerate(_FLUX)}
+_FLUX_BY_CODE: NDArray[np.float64] = np.array(list(_FLUX.values()))
+
+# Shared PCG64 generator; pass `rng=` to APD_Detector for reproducible runs
+_RNG: np.random.Generator = np.random.default_rng()
+
+
+class _DrawPool:
+    """
+    Recycled buffer of pre-drawn random variates for the scalar detect() path.
+    `draw(size)` is called once per refill (e.g. Generator.standard_normal or
+    Generator.random), replacing thousands of scalar NumPy calls. Draws are
+    held as a Python list so each next() is a plain float index, and the
+    first refill happens lazily on the first draw.
+    """
+
+    def __init__(self, draw: Callable[[int], NDArray[np.float64]], size: int = 4096) -> None:
+        self._draw: Callable[[int], NDArray[np.float64]] = draw
+        self._size: int = size
+        self._buf: list[float] = []
+        self._cursor: int = 0
+
+    def next(self) -> float:
+        """Return the next pre-drawn variate, refilling the buffer when exhausted."""
+        if self._cursor == len(self._buf):
+            self._buf = self._draw(self._size).tolist()
+            self._cursor = 0
+        x = self._buf[self._cursor]
+        self._cursor += 1
+        return x
+
+    def sample(self, mean: float, std: float) -> float:
+        """Return mean + std · next(); for a standard-normal pool, one N(mean, std²) draw."""
+        return mean + std * self.next()
+
 
 class LaserSource:
     """
@@ -50,16 +114,35 @@ class LaserSource:
             Tuple of (QState, photon_flux).
         """
         q_state = phys.QState.from_label(label)
+        photon_flux: float = _FLUX.get(intensity_mode, 0.1)
+        return q_state, photon_flux
 
-        photon_flux: float
-        if intensity_mode == 'single_photon':
-            photon_flux = 0.1
-        elif intensity_mode == 'blinding':
-            photon_flux = 1e9    # exceeds APD saturation limit → linear mode
-        else:
-            photon_flux = 0.1
+    def emit_batch(
+        self,
+        labels: Sequence[str],
+        intensity_modes: str | Sequence[str] = 'single_photon',
+    ) -> tuple[phys.QStateBatch, NDArray[np.float64]]:
+        """
+        Vectorised equivalent of calling emit() once per pulse.
 
-        return q_state, photon_flux
+        Args:
+            labels:          Polarisation label per pulse ('H', 'V', 'D', 'A').
+            intensity_modes: One mode for the whole batch, or one per pulse.
+
+        Returns:
+            Tuple of (QStateBatch register of N states, photon_flux array of length N).
+        """
+        n: int = len(labels)
+        q_states = phys.QStateBatch.from_labels(labels)
+
+        if isinstance(intensity_modes, str):
+            flux = np.full(n, _FLUX.get(intensity_modes, 0.1))
+        else:
+            codes = np.fromiter(
+                (_MODE_CODE.get(m, 0) for m in intensity_modes), dtype=np.intp, count=n,
+            )
+            flux = _FLUX_BY_CODE[codes]
+        return q_states, flux
 
 
 class APD_Detector:
@@ -75,7 +158,7 @@ class APD_Detector:
       - Normal Geiger-mode operation (~3.3 V, ~1.2 ns jitter, 25% efficiency)
     """
 
-    def __init__(self, efficiency: float = 0.25) -> None:
+    def __init__(self, efficiency: float = 0.25, rng: np.random.Generator | None = None) -> None:
         self.base_efficiency: float  = efficiency
         self.saturation_limit: float = 1e7         # photons/s → triggers linear mode
         self.attack_mode: str        = "none"
@@ -84,6 +167,10 @@ class APD_Detector:
         self.current_voltage: float  = 0.0
         self.current_jitter: float   = 0.0
 
+        self._rng: np.random.Generator = rng if rng is not None else _RNG
+        self._npool: _DrawPool       = _DrawPool(self._rng.standard_normal)
+        self._upool: _DrawPool       = _DrawPool(self._rng.random)
+
     def set_attack_mode(self, mode: str) -> None:
         """Set the operating mode: 'none', 'timeshift', 'zeroday', or implicitly 'blinding' (via flux)."""
         self.attack_mode = mode
@@ -110,56 +197,152 @@ class APD_Detector:
             (dead time, efficiency miss, or time-shift gate-edge rejection).
         """
         # -- Dead time gate -----------------------------------------------
-        if current_time - self.last_click_time < CONSTANTS['dead_time']:
+        if current_time - self.last_click_time < _DEAD_TIME:
             return None
 
         # -- Dark count -------------------------------------------------------
-        if np.random.random() < CONSTANTS['dark_count_prob']:
-            self.current_voltage = float(np.random.normal(3.3, 0.2))
-            self.current_jitter  = float(np.random.normal(1.2, 0.5))
+        if self._upool.next() < _DARK_PROB:
+            self.current_voltage = self._npool.sample(3.3, 0.2)
+            self.current_jitter  = self._npool.sample(1.2, 0.5)
             self.last_click_time = current_time
-            return int(np.random.choice([0, 1]))
+            return int(self._upool.next() < 0.5)
 
-        measurement: int = q_state.measure(basis)
+        measurement: int = q_state.measure(basis, self._rng)
 
         # Rare detector bit-flip (~0.5% misread rate)
-        if np.random.random() < 0.005:
+        if self._upool.next() < _FLIP_PROB:
             measurement = 1 - measurement
 
         # -- Detector Blinding (saturation) -----------------------------------
         if incident_flux > self.saturation_limit:
-            self.current_voltage = float(np.random.normal(9.0, 0.05))
-            self.current_jitter  = float(np.random.normal(0.1, 0.01))
+            self.current_voltage = self._npool.sample(9.0, 0.05)
+            self.current_jitter  = self._npool.sample(0.1, 0.01)
             self.last_click_time = current_time
             return measurement
 
         # -- Time-Shift attack (efficiency mismatch) --------------------------
         elif self.attack_mode == "timeshift":
-            self.current_voltage = float(np.random.normal(3.3, 0.2))
-            self.current_jitter  = float(np.random.normal(CONSTANTS['jitter_attack_ns'], 0.01))
-            if np.random.random() < 0.15:     # only 15% of pulses hit the gate
+            self.current_voltage = self._npool.sample(3.3, 0.2)
+            self.current_jitter  = self._npool.sample(_JITTER_ATTACK, 0.01)
+            if self._upool.next() < 0.15:     # only 15% of pulses hit the gate
                 self.last_click_time = current_time
                 return measurement
             return None
 
         # -- Zero-Day anomaly injection ---------------------------------------
         elif self.attack_mode == "zeroday":
-            self.current_voltage = float(np.random.normal(6.5, 0.1))
-            self.current_jitter  = float(np.random.normal(2.8, 0.1))
-            if np.random.random() < 0.25:
+            self.current_voltage = self._npool.sample(6.5, 0.1)
+            self.current_jitter  = self._npool.sample(2.8, 0.1)
+            if self._upool.next() < 0.25:
                 self.last_click_time = current_time
                 return measurement
             return None
 
         # -- Normal Geiger-mode operation -------------------------------------
         else:
-            self.current_voltage = float(np.random.normal(3.3, 0.2))
-            self.current_jitter  = float(np.random.normal(1.2, 0.2))
-            if np.random.random() < self.base_efficiency:
+            self.current_voltage = self._npool.sample(3.3, 0.2)
+            self.current_jitter  = self._npool.sample(1.2, 0.2)
+            if self._upool.next() < self.base_efficiency:
                 self.last_click_time = current_time
                 return measurement
             return None
 
+    def detect_batch(
+        self,
+        q_states: phys.QStateBatch | Sequence[phys.QState],
+        incident_flux: float | NDArray[np.float64],
+        bases: NDArray[np.int_] | Sequence[str],
+        times: NDArray[np.float64],
+    ) -> tuple[NDArray[np.int8], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Vectorised equivalent of calling detect() once per pulse.
+
+        All random draws are made in bulk and the dark-count / blinding /
+        time-shift / zero-day / normal branches are selected with masks.
+        Only the dead-time gate is evaluated sequentially.
+
+        Args:
+            q_states:      Incoming quantum states, one per pulse: a QStateBatch
+                           register or a sequence of QState objects.
+            incident_flux: Photon flux per pulse (scalar or array of length N).
+            bases:         Measurement bases per pulse, either as detect() takes them
+                           ('rectilinear' / 'diagonal') or as integer codes
+                           (0 = rectilinear, 1 = diagonal).
+            times:         Pulse arrival times in seconds (non-decreasing).
+
+        Returns:
+            Tuple of (outcomes, voltages, jitters). `outcomes` holds 0/1 for a
+            click and -1 where the detector did not fire. Telemetry arrays hold
+            the detector reading after each pulse, as current_voltage /
+            current_jitter would after the equivalent detect() call.
+        """
+        n: int = len(q_states)
+        times = np.asarray(times, dtype=np.float64)
+        flux  = np.broadcast_to(np.asarray(incident_flux, dtype=np.float64), (n,))
+
+        u, u_born        = self._rng.random((2, n))
+        z_volt, z_jitter = self._rng.standard_normal((2, n))
+
+        # -- One uniform drives dark count, bit-flip and gate ------------------
+        # [0, p_dark) is a dark count; the remainder is rescaled to a fresh
+        # U[0, 1) for the flip test, and whichever flip sub-interval it lands
+        # in is rescaled again to give the gate draw. Each test sees an
+        # independent uniform, so the statistics match separate draws.
+        dark = u < _DARK_PROB
+        u_flip = (u - _DARK_PROB) / (1.0 - _DARK_PROB)
+        flip = u_flip < _FLIP_PROB
+        u_gate = np.where(flip, u_flip / _FLIP_PROB, (u_flip - _FLIP_PROB) / (1.0 - _FLIP_PROB))
+
+        # -- Branch selection (dark count overrides everything) ---------------
+        if self.attack_mode == "timeshift":
+            mode_branch = _BRANCH_TIMESHIFT
+        elif self.attack_mode == "zeroday":
+            mode_branch = _BRANCH_ZERODAY
+        else:
+            mode_branch = _BRANCH_NORMAL
+
+        branch = np.full(n, mode_branch, dtype=np.intp)
+        branch[flux > self.saturation_limit] = _BRANCH_BLINDING
+        branch[dark]                         = _BRANCH_DARK
+
+        # -- Born-rule outcome with rare detector bit-flip ---------------------
+        bases_arr = np.asarray(bases)
+        diagonal  = bases_arr == ('diagonal' if bases_arr.dtype.kind in 'UO' else 1)
+        if isinstance(q_states, phys.QStateBatch):
+            prob_zero = q_states.probabilities(diagonal)
+        else:
+            prob_zero = phys.born_probabilities(q_states, diagonal)
+        bits = (u_born >= prob_zero) ^ flip
+        bits[dark] = u_born[dark] < 0.5
+
+        # -- Gate efficiency per branch, then sequential dead-time gating ------
+        gate_prob = np.array([1.0, 1.0, 0.15, 0.25, self.base_efficiency])
+        candidate = u_gate < gate_prob[branch]
+        alive, last_click = apply_dead_time(
+            times, candidate, _DEAD_TIME, self.last_click_time,
+        )
+        fired = alive & candidate
+
+        outcomes: NDArray[np.int8] = np.where(fired, bits, -1).astype(np.int8)
+
+        # -- Telemetry: dead pulses leave the previous reading untouched -------
+        voltages = _VOLTAGE_MU[branch] + _VOLTAGE_SIGMA[branch] * z_volt
+        jitters  = _JITTER_MU[branch]  + _JITTER_SIGMA[branch]  * z_jitter
+
+        if not alive.all():
+            src = np.where(alive, np.arange(n), -1)
+            np.maximum.accumulate(src, out=src)
+            held = src < 0
+            voltages = np.where(held, self.current_voltage, voltages[src])
+            jitters  = np.where(held, self.current_jitter,  jitters[src])
+
+        if n > 0:
+            self.current_voltage = float(voltages[-1])
+            self.current_jitter  = float(jitters[-1])
+        self.last_click_time = last_click
+
+        return outcomes, voltages, jitters
+
 
 if __name__ == "__main__":
     print("--- HARDWARE COMPONENT TEST ---")
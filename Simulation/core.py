@@ -3,20 +3,78 @@ Simulation/core.py
 Vectorized BB84 quantum engine.
 Uses NumPy state matrices for high-throughput simulation of photon
 encoding, channel transmission, measurement, and key sifting.
+
+Per-qubit classical data is held as structure-of-arrays uint8 vectors
+(1 byte per qubit): Alice.bits/bases/key and Bob.bases/measured_bits/key,
+including the subclasses in attacker.py and noise.py. Only the channel
+payload carries amplitudes.
 """
 __author__ = "Rahul Rajesh 2360445"
 
 import numpy as np
 from numpy.typing import NDArray
 
+from _jit import NUMBA_AVAILABLE
+from _bb84_kernels import measure_born, prepare_states
+
 # ---------------------------------------------------------------------------
 # Basis kets and Hadamard gate (reused across all simulations)
 # ---------------------------------------------------------------------------
-KET_0: NDArray[np.float64] = np.array([1.0, 0.0])
-KET_1: NDArray[np.float64] = np.array([0.0, 1.0])
+# Amplitudes are only ever 0, ±1 or ±1/√2, so float32 is exact enough for
+# Born-rule sampling and halves the bytes moved through the channel.
+AMP_DTYPE = np.float32
+
+KET_0: NDArray[np.float32] = np.array([1.0, 0.0], dtype=AMP_DTYPE)
+KET_1: NDArray[np.float32] = np.array([0.0, 1.0], dtype=AMP_DTYPE)
 
 _K: float = 1.0 / np.sqrt(2.0)
-H_GATE: NDArray[np.float64] = np.array([[_K, _K], [_K, -_K]])
+H_GATE: NDArray[np.float32] = np.asfortranarray([[_K, _K], [_K, -_K]], dtype=AMP_DTYPE)
+
+# Shared PCG64 generator; pass `rng=` to Alice/Bob for reproducible runs
+_RNG: np.random.Generator = np.random.default_rng()
+
+
+def sift_indices(
+    bases_a: NDArray[np.uint8],
+    bases_b: NDArray[np.uint8],
+) -> NDArray[np.intp]:
+    """
+    Indices of the qubits where both parties chose the same basis.
+    Computed once per round and shared by both sides' sift_key(); gathering
+    with an index array is several times faster than two boolean-mask copies.
+    """
+    return np.flatnonzero(bases_a == bases_b)
+
+
+def run_round(
+    n_qubits: int | tuple[int, int],
+    rng: np.random.Generator | None = None,
+) -> tuple[NDArray[np.uint8], NDArray[np.uint8], NDArray[np.uint8], NDArray[np.uint8], NDArray[np.bool_]]:
+    """
+    One noiseless BB84 round without materialising the amplitude matrix.
+
+    Over an ideal channel Bob's outcome is Alice's bit when the bases match
+    and a fair coin otherwise, so prepare → transmit → measure reduces to two
+    [0, 4) draws per qubit (bit/basis for Alice, basis/coin for Bob) and one
+    select. Passing a (n_runs, n_qubits) shape draws independent rounds as
+    rows of 2-D arrays.
+
+    Returns:
+        (alice_bits, alice_bases, bob_bases, bob_bits, match) — four uint8
+        arrays and the boolean basis-match mask.
+    """
+    rng = rng if rng is not None else _RNG
+    alice_pair = rng.integers(0, 4, n_qubits, dtype=np.uint8)
+    bob_pair   = rng.integers(0, 4, n_qubits, dtype=np.uint8)
+
+    alice_bits  = alice_pair & 1
+    alice_bases = alice_pair >> 1
+    bob_bases   = bob_pair & 1
+    coin        = bob_pair >> 1
+
+    match    = alice_bases == bob_bases
+    bob_bits = np.where(match, alice_bits, coin)
+    return alice_bits, alice_bases, bob_bases, bob_bits, match
 
 
 class Alice:
@@ -26,30 +84,56 @@ class Alice:
     (rectilinear=0, diagonal=1) via vectorized state matrix operations.
     """
 
-    def __init__(self, n_qubits: int) -> None:
+    def __init__(self, n_qubits: int, rng: np.random.Generator | None = None) -> None:
         self.n: int = n_qubits
-        self.bits:         NDArray[np.int_] | None = None
-        self.bases:        NDArray[np.int_] | None = None
-        self.key:          NDArray[np.int_] | None = None
-        self.state_matrix: NDArray[np.float64] = np.zeros((2, self.n))
+        self._rng: np.random.Generator = rng if rng is not None else _RNG
+        self.bits:         NDArray[np.uint8] | None = None
+        self.bases:        NDArray[np.uint8] | None = None
+        self.key:          NDArray[np.uint8] | None = None
+        self.state_matrix: NDArray[np.float32] = np.zeros((2, self.n), dtype=AMP_DTYPE)
+        # Per-shot outputs are written into these buffers, reused across shots
+        self._bits_buf:    NDArray[np.uint8]   = np.empty(self.n, dtype=np.uint8)
+        self._bases_buf:   NDArray[np.uint8]   = np.empty(self.n, dtype=np.uint8)
+
+    def reset(self) -> None:
+        """Drop per-shot outputs so the instance can run another shot on the same buffers."""
+        self.bits = None
+        self.bases = None
+        self.key = None
 
     def prepare_qubits(self) -> None:
         """Randomly choose bits and bases, build state vectors, apply H for diagonal encoding."""
-        self.bits  = np.random.randint(0, 2, self.n)
-        self.bases = np.random.randint(0, 2, self.n)
-
-        self.state_matrix[0, :] = (self.bits == 0).astype(float)
-        self.state_matrix[1, :] = (self.bits == 1).astype(float)
-
-        diag_indices: NDArray[np.intp] = np.where(self.bases == 1)[0]
-        if len(diag_indices) > 0:
-            states_to_rotate = self.state_matrix[:, diag_indices]
-            self.state_matrix[:, diag_indices] = H_GATE @ states_to_rotate
-
-    def sift_key(self, bob_bases: NDArray[np.int_]) -> NDArray[np.int_]:
+        # One draw in [0, 4) per qubit: bit 0 is the key bit, bit 1 the basis
+        pair = self._rng.integers(0, 4, self.n, dtype=np.uint8)
+        self.bits  = np.bitwise_and(pair, 1, out=self._bits_buf)
+        self.bases = np.right_shift(pair, 1, out=self._bases_buf)
+
+        if NUMBA_AVAILABLE:
+            # Single fused pass: encode and rotate each qubit in registers
+            prepare_states(self.bits, self.bases, self.state_matrix[0], self.state_matrix[1])
+            return
+
+        # Closed-form amplitudes instead of an H matmul over the diagonal columns:
+        #   rectilinear -> (1 - b, b)      diagonal -> (K, K * (1 - 2b))
+        b = self.bits
+        is_diag = self.bases == 1
+        row0, row1 = self.state_matrix
+
+        np.subtract(1.0, b, out=row0)
+        np.subtract(row0, b, out=row1)
+        row1 *= _K
+        np.copyto(row1, b, where=~is_diag)
+        np.copyto(row0, _K, where=is_diag)
+
+    def sift_key(
+        self,
+        bob_bases: NDArray[np.uint8],
+        match_idx: NDArray[np.intp] | None = None,
+    ) -> NDArray[np.uint8]:
         """Retain only bits where Alice's and Bob's bases matched."""
-        match_mask = self.bases == bob_bases
-        self.key   = self.bits[match_mask]
+        if match_idx is None:
+            match_idx = sift_indices(self.bases, bob_bases)
+        self.key = self.bits.take(match_idx)
         return self.key
 
 
@@ -60,39 +144,63 @@ class Bob:
     using the Born rule via vectorized probability computation.
     """
 
-    def __init__(self, n_qubits: int) -> None:
+    def __init__(self, n_qubits: int, rng: np.random.Generator | None = None) -> None:
         self.n: int = n_qubits
-        self.bases:         NDArray[np.int_] | None = None
-        self.measured_bits: NDArray[np.int_] | None = None
-        self.key:           NDArray[np.int_] | None = None
-
-    def measure_qubits(self, state_matrix: NDArray[np.float64]) -> None:
+        self._rng: np.random.Generator = rng if rng is not None else _RNG
+        self.bases:         NDArray[np.uint8] | None = None
+        self.measured_bits: NDArray[np.uint8] | None = None
+        self.key:           NDArray[np.uint8] | None = None
+        # Per-shot outputs are written into these buffers, reused across shots
+        self._uniform_buf:  NDArray[np.float32] = np.empty(self.n, dtype=np.float32)
+        self._measured_buf: NDArray[np.uint8]   = np.empty(self.n, dtype=np.uint8)
+
+    def reset(self) -> None:
+        """Drop per-shot outputs so the instance can run another shot on the same buffers."""
+        self.bases = None
+        self.measured_bits = None
+        self.key = None
+
+    def measure_qubits(self, state_matrix: NDArray[np.float32]) -> None:
         """
-        Randomly select measurement bases; apply H for diagonal basis;
-        sample outcomes from the Born rule probability distribution.
+        Randomly select measurement bases and sample outcomes from the Born rule.
+        The diagonal-basis probability is taken directly from row 0 of H·ψ,
+        i.e. |s0 + s1|² / 2, so the incoming states are never copied or rotated.
         """
-        self.bases = np.random.randint(0, 2, self.n)
-
-        current_states: NDArray[np.float64] = state_matrix.copy()
-        diag_indices: NDArray[np.intp] = np.where(self.bases == 1)[0]
-        if len(diag_indices) > 0:
-            current_states[:, diag_indices] = H_GATE @ current_states[:, diag_indices]
-
-        prob_zero: NDArray[np.float64] = np.abs(current_states[0, :]) ** 2
-        rng: NDArray[np.float64]       = np.random.random(self.n)
-        self.measured_bits = np.where(rng < prob_zero, 0, 1)
-
-    def sift_key(self, alice_bases: NDArray[np.int_]) -> NDArray[np.int_]:
+        self.bases = self._rng.integers(0, 2, self.n, dtype=np.uint8)
+
+        s0: NDArray[np.float32] = state_matrix[0]
+        s1: NDArray[np.float32] = state_matrix[1]
+        rng: NDArray[np.float32] = self._rng.random(dtype=np.float32, out=self._uniform_buf)
+
+        if NUMBA_AVAILABLE:
+            # Single fused pass: amplitude, |·|² and comparison per qubit
+            self.measured_bits = measure_born(s0, s1, self.bases, rng, self._measured_buf)
+            return
+
+        prob_zero: NDArray[np.float32] = np.where(
+            self.bases == 1,
+            0.5 * (s0 + s1) * (s0 + s1),
+            s0 * s0,
+        )
+        np.greater_equal(rng, prob_zero, out=self._measured_buf.view(np.bool_))
+        self.measured_bits = self._measured_buf
+
+    def sift_key(
+        self,
+        alice_bases: NDArray[np.uint8],
+        match_idx: NDArray[np.intp] | None = None,
+    ) -> NDArray[np.uint8]:
         """Retain only bits where Bob's and Alice's bases matched."""
-        match_mask = self.bases == alice_bases
-        self.key   = self.measured_bits[match_mask]
+        if match_idx is None:
+            match_idx = sift_indices(self.bases, alice_bases)
+        self.key = self.measured_bits.take(match_idx)
         return self.key
 
 
 class QuantumChannel:
     """Ideal (noiseless) quantum channel — pass-through only."""
 
-    def transmit(self, state_matrix: NDArray[np.float64]) -> NDArray[np.float64]:
+    def transmit(self, state_matrix: NDArray[np.float32]) -> NDArray[np.float32]:
         return state_matrix
 
 
@@ -101,11 +209,35 @@ class ClassicalChannel:
 
     @staticmethod
     def calc_error_rate(
-        key_a: NDArray[np.int_],
-        key_b: NDArray[np.int_],
+        key_a: NDArray[np.uint8],
+        key_b: NDArray[np.uint8],
     ) -> float:
-        """Compute QBER between Alice's and Bob's sifted keys."""
+        """
+        Compute QBER between Alice's and Bob's sifted keys.
+        Keys are 0/1-valued, so a XOR b is non-zero exactly at the errors and
+        counts faster than a boolean != mask.
+        """
         if len(key_a) == 0:
             return 0.0
-        errors: int = int(np.count_nonzero(key_a != key_b))
-        return errors / len(key_a)
\ No newline at end of file
+        errors: int = int(np.count_nonzero(np.bitwise_xor(key_a, key_b)))
+        return errors / len(key_a)
+
+    @staticmethod
+    def calc_packed_error_rate(
+        packed_a: NDArray[np.uint8],
+        packed_b: NDArray[np.uint8],
+        n_bits: int,
+    ) -> float:
+        """
+        Compute QBER between two np.packbits-encoded keys of `n_bits` bits.
+        Errors are counted as popcount(a XOR b), 64 key bits per uint64 word;
+        the < 8 trailing bytes are counted bytewise, and zero padding in the
+        last byte cancels in the XOR.
+        """
+        if n_bits == 0:
+            return 0.0
+        m: int = len(packed_a) // 8 * 8
+        words = np.bitwise_xor(packed_a[:m].view(np.uint64), packed_b[:m].view(np.uint64))
+        errors: int = (int(np.bitwise_count(words).sum(dtype=np.int64))
+                       + int(np.bitwise_count(packed_a[m:] ^ packed_b[m:]).sum(dtype=np.int64)))
+        return errors / n_bits
@@ -7,9 +7,11 @@ von Neumann entropy, and state fidelity.
 """
 __author__ = "Rahul Rajesh 2360445"
 
+import math
+from collections.abc import Sequence
+
 import numpy as np
 from numpy.typing import NDArray
-from scipy.linalg import logm  # noqa: F401 (available for future use)
 
 # ---------------------------------------------------------------------------
 # Pauli matrices and Hadamard gate
@@ -20,6 +22,28 @@ Y: NDArray[np.complex128] = np.array([[0, -1j], [1j, 0]], dtype=complex)
 Z: NDArray[np.complex128] = np.array([[1, 0], [0, -1]], dtype=complex)
 H: NDArray[np.complex128] = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)
 
+# Density matrices of the four BB84 polarisation states, |ψ⟩⟨ψ|
+_RHO: dict[str, NDArray[np.complex128]] = {
+    'H': np.array([[1, 0], [0, 0]], dtype=complex),
+    'V': np.array([[0, 0], [0, 1]], dtype=complex),
+    'D': 0.5 * np.array([[1, 1], [1, 1]], dtype=complex),
+    'A': 0.5 * np.array([[1, -1], [-1, 1]], dtype=complex),
+}
+
+# Shared PCG64 generator for measurement outcomes; pass `rng=` for reproducible runs
+_RNG: np.random.Generator = np.random.default_rng()
+
+
+def _binary_entropy(p: float) -> float:
+    """H(p) = −p log₂ p − (1 − p) log₂(1 − p); eigenvalues ≤ 1e-10 count as 0."""
+    q: float = 1.0 - p
+    h: float = 0.0
+    if p > 1e-10:
+        h -= p * math.log2(p)
+    if q > 1e-10:
+        h -= q * math.log2(q)
+    return h
+
 
 class QState:
     """
@@ -37,10 +61,20 @@ class QState:
     def __init__(self, matrix: NDArray[np.complex128] | None = None) -> None:
         if matrix is None:
             # Default: |0⟩⟨0|  (horizontal polarisation)
-            self.rho: NDArray[np.complex128] = np.array([[1, 0], [0, 0]], dtype=complex)
+            self.rho: NDArray[np.complex128] = _RHO['H'].copy()
         else:
-            self.rho = np.array(matrix, dtype=complex)
-            self.rho = self.rho / np.trace(self.rho)   # enforce unit trace
+            # No defensive copy: every QState operation rebinds self.rho
+            # rather than writing into it, so aliasing the caller's array is safe
+            rho = np.asarray(matrix, dtype=complex)
+            tr: complex = rho.trace()
+            self.rho = rho if tr == 1.0 else rho / tr   # enforce unit trace
+
+    @classmethod
+    def _from_trusted(cls, rho: NDArray[np.complex128]) -> "QState":
+        """Wrap a complex, unit-trace ρ as-is, skipping conversion and normalisation."""
+        state = cls.__new__(cls)
+        state.rho = rho
+        return state
 
     @classmethod
     def from_label(cls, label: str) -> "QState":
@@ -54,16 +88,9 @@ class QState:
         Returns:
             QState with ρ = |ψ⟩⟨ψ|.
         """
-        ket_map: dict[str, NDArray[np.complex128]] = {
-            'H': np.array([[1], [0]], dtype=complex),
-            'V': np.array([[0], [1]], dtype=complex),
-            'D': (1 / np.sqrt(2)) * np.array([[1], [1]], dtype=complex),
-            'A': (1 / np.sqrt(2)) * np.array([[1], [-1]], dtype=complex),
-        }
-        if label not in ket_map:
-            raise ValueError(f"Unknown label '{label}'. Valid labels: {list(ket_map.keys())}")
-        ket = ket_map[label]
-        return cls(np.outer(ket, ket.conj()))
+        if label not in _RHO:
+            raise ValueError(f"Unknown label '{label}'. Valid labels: {list(_RHO.keys())}")
+        return cls._from_trusted(_RHO[label].copy())   # never alias the shared constant
 
     def apply_unitary(self, U: NDArray[np.complex128]) -> None:
         """Apply a unitary gate U: ρ → U ρ U†."""
@@ -77,45 +104,36 @@ class QState:
         """
         self.rho = (1 - p) * self.rho + p * (I / 2.0)
 
-    def measure(self, basis: str) -> int:
+    def measure(self, basis: str, rng: np.random.Generator | None = None) -> int:
         """
         Perform a projective measurement and collapse the state (Lüders rule).
 
         Args:
             basis: 'rectilinear' (Z-basis: |H⟩/|V⟩) or 'diagonal' (X-basis: |D⟩/|A⟩).
+            rng:   Generator for the outcome draw; defaults to the module PCG64 generator.
 
         Returns:
             Measurement outcome: 0 or 1.
         """
-        P0: NDArray[np.complex128]
-        P1: NDArray[np.complex128]
-
+        rho = self.rho
+        # ⟨H|ρ|H⟩ = ρ00, ⟨D|ρ|D⟩ = ½(ρ00 + ρ11) + Re ρ01, and the orthogonal outcomes alike
         if basis == 'rectilinear':
-            P0 = np.array([[1, 0], [0, 0]], dtype=complex)
-            P1 = np.array([[0, 0], [0, 1]], dtype=complex)
+            prob_0: float = rho[0, 0].real
+            prob_1: float = rho[1, 1].real
+            labels = ('H', 'V')
         elif basis == 'diagonal':
-            d  = (1 / np.sqrt(2)) * np.array([[1], [1]], dtype=complex)
-            a  = (1 / np.sqrt(2)) * np.array([[1], [-1]], dtype=complex)
-            P0 = np.outer(d, d.conj())
-            P1 = np.outer(a, a.conj())
+            mean: float = 0.5 * (rho[0, 0].real + rho[1, 1].real)
+            prob_0 = mean + rho[0, 1].real
+            prob_1 = mean - rho[0, 1].real
+            labels = ('D', 'A')
         else:
             raise ValueError(f"Unknown basis '{basis}'. Use 'rectilinear' or 'diagonal'.")
 
-        prob_0: float = float(np.real(np.trace(P0 @ self.rho)))
-        prob_1: float = float(np.real(np.trace(P1 @ self.rho)))
+        u: float = (rng if rng is not None else _RNG).random()
+        result: int = 0 if u < prob_0 / (prob_0 + prob_1) else 1
 
-        total: float = prob_0 + prob_1
-        prob_0, prob_1 = prob_0 / total, prob_1 / total
-
-        result: int = int(np.random.choice([0, 1], p=[prob_0, prob_1]))
-
-        # Lüders collapse: ρ' = (P ρ P) / Tr(P ρ)
-        projector = P0 if result == 0 else P1
-        norm      = float(np.real(np.trace(projector @ self.rho)))
-        if norm > 1e-15:
-            self.rho = (projector @ self.rho @ projector) / norm
-        else:
-            self.rho = projector
+        # Lüders collapse onto a rank-1 projector P = |ψ⟩⟨ψ|: PρP / Tr(Pρ) = P
+        self.rho = _RHO[labels[result]].copy()
 
         return result
 
@@ -124,9 +142,12 @@ class QState:
         Compute the von Neumann entropy S(ρ) = −Tr(ρ log₂ ρ) in bits.
         Returns 0 for a pure state, 1 for the fully mixed state.
         """
-        evals: NDArray[np.float64] = np.linalg.eigvalsh(self.rho)
-        evals = evals[evals > 1e-10]          # discard numerical noise near 0
-        return float(-np.sum(evals * np.log2(evals)))
+        # Eigenvalues of a unit-trace Hermitian 2×2: ½ ± √(¼ − det ρ)
+        rho01: complex = self.rho[0, 1]
+        det: float = (self.rho[0, 0].real * self.rho[1, 1].real
+                      - (rho01.real * rho01.real + rho01.imag * rho01.imag))
+        r: float = math.sqrt(max(0.25 - det, 0.0))
+        return _binary_entropy(0.5 + r)
 
     def get_fidelity(self, target_label: str) -> float:
         """
@@ -138,8 +159,175 @@ class QState:
         Returns:
             Fidelity in [0, 1].
         """
-        target = QState.from_label(target_label)
-        return float(np.real(np.trace(target.rho @ self.rho)))
+        if target_label not in _RHO:
+            raise ValueError(f"Unknown label '{target_label}'. Valid labels: {list(_RHO.keys())}")
+        return float(np.real(np.trace(_RHO[target_label] @ self.rho)))
+
+
+def born_probabilities(
+    states: Sequence[QState],
+    diagonal: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """
+    Probability of outcome 0 for a batch of states, without collapsing them.
+
+    Args:
+        states:   Sequence of N QState objects.
+        diagonal: Boolean array of length N; True selects the X-basis (|D⟩/|A⟩),
+                  False the Z-basis (|H⟩/|V⟩).
+
+    Returns:
+        Array of N probabilities: ⟨H|ρ|H⟩ (rectilinear) or ⟨D|ρ|D⟩ (diagonal).
+    """
+    rho: NDArray[np.complex128] = np.array(
+        [q.rho for q in states], dtype=complex,
+    ).reshape(-1, 2, 2)                       # keeps an empty batch 3-D
+    p_rect = rho[:, 0, 0].real
+    p_diag = 0.5 * (rho[:, 0, 0].real + rho[:, 1, 1].real) + rho[:, 0, 1].real
+    return np.where(diagonal, p_diag, p_rect)
+
+
+# ---------------------------------------------------------------------------
+# Batched register in Bloch-vector form
+# ---------------------------------------------------------------------------
+# ρ = ½ (I + rx·X + ry·Y + rz·Z); the BB84 states sit on the ±X / ±Z axes.
+_BLOCH_LABELS: dict[str, tuple[float, float, float]] = {
+    'H': (0.0, 0.0, 1.0),
+    'V': (0.0, 0.0, -1.0),
+    'D': (1.0, 0.0, 0.0),
+    'A': (-1.0, 0.0, 0.0),
+}
+
+
+class QStateBatch:
+    """
+    Register of N single-qubit states held as structure-of-arrays Bloch
+    components (rx, ry, rz), each a float64 array of shape (N,).
+
+    Mirrors the QState operations that the BB84 / APD paths use, applied to
+    the whole register with a handful of array operations:
+      - Construction from polarisation labels
+      - Pauli / Hadamard gates as axis swaps and sign flips
+      - Depolarizing noise as a uniform shrink of the Bloch vector
+      - Batched projective measurement with Lüders collapse
+      - von Neumann entropy and fidelity per state
+    """
+
+    __slots__ = ('rx', 'ry', 'rz')
+
+    def __init__(
+        self,
+        rx: NDArray[np.float64],
+        ry: NDArray[np.float64],
+        rz: NDArray[np.float64],
+    ) -> None:
+        self.rx: NDArray[np.float64] = np.asarray(rx, dtype=np.float64)
+        self.ry: NDArray[np.float64] = np.asarray(ry, dtype=np.float64)
+        self.rz: NDArray[np.float64] = np.asarray(rz, dtype=np.float64)
+
+    @classmethod
+    def from_labels(cls, labels: Sequence[str]) -> "QStateBatch":
+        """
+        Construct a register of pure states from polarisation labels.
+
+        Args:
+            labels: Sequence of 'H', 'V', 'D' or 'A', one per qubit.
+
+        Returns:
+            QStateBatch with one Bloch vector per label.
+        """
+        try:
+            vecs = np.array([_BLOCH_LABELS[label] for label in labels], dtype=np.float64)
+        except KeyError as exc:
+            raise ValueError(
+                f"Unknown label {exc.args[0]!r}. Valid labels: {list(_BLOCH_LABELS)}"
+            ) from None
+        vecs = vecs.reshape(-1, 3)
+        return cls(vecs[:, 0].copy(), vecs[:, 1].copy(), vecs[:, 2].copy())
+
+    def __len__(self) -> int:
+        return self.rx.shape[0]
+
+    def apply_unitary(self, gate: str) -> None:
+        """
+        Apply the same single-qubit gate to every state: 'X', 'Y', 'Z' or 'H'.
+        Each acts on the Bloch vector as a signed permutation of (rx, ry, rz).
+        """
+        if gate == 'X':
+            np.negative(self.ry, out=self.ry)
+            np.negative(self.rz, out=self.rz)
+        elif gate == 'Y':
+            np.negative(self.rx, out=self.rx)
+            np.negative(self.rz, out=self.rz)
+        elif gate == 'Z':
+            np.negative(self.rx, out=self.rx)
+            np.negative(self.ry, out=self.ry)
+        elif gate == 'H':
+            self.rx, self.rz = self.rz, self.rx
+            np.negative(self.ry, out=self.ry)
+        else:
+            raise ValueError(f"Unknown gate '{gate}'. Use 'X', 'Y', 'Z' or 'H'.")
+
+    def apply_depolarizing_noise(self, p: float) -> None:
+        """ρ → (1 − p) ρ + p (I/2), i.e. r → (1 − p) r for every state."""
+        for comp in (self.rx, self.ry, self.rz):
+            comp *= (1.0 - p)
+
+    def get_entropy(self) -> NDArray[np.float64]:
+        """
+        von Neumann entropy per state in bits. The eigenvalues of ρ are
+        ½(1 ± |r|), so S = H(½(1 + |r|)) with H the binary entropy.
+        """
+        half_r = 0.5 * np.sqrt(self.rx * self.rx + self.ry * self.ry + self.rz * self.rz)
+        p = 0.5 + half_r
+        q = 0.5 - half_r
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.where(p > 1e-10, -p * np.log2(p), 0.0)
+                    + np.where(q > 1e-10, -q * np.log2(q), 0.0))
+
+    def get_fidelity(self, target_label: str) -> NDArray[np.float64]:
+        """
+        Fidelity Tr(σ ρ) per state with a target pure state σ, which for
+        Bloch vectors r and t is ½(1 + r·t).
+        """
+        if target_label not in _BLOCH_LABELS:
+            raise ValueError(f"Unknown label '{target_label}'. Valid labels: {list(_BLOCH_LABELS)}")
+        tx, ty, tz = _BLOCH_LABELS[target_label]
+        return 0.5 * (1.0 + tx * self.rx + ty * self.ry + tz * self.rz)
+
+    def probabilities(self, diagonal: NDArray[np.bool_]) -> NDArray[np.float64]:
+        """
+        Probability of outcome 0 per state, without collapsing:
+        ½(1 + rz) in the Z-basis, ½(1 + rx) in the X-basis.
+        """
+        return 0.5 * (1.0 + np.where(diagonal, self.rx, self.rz))
+
+    def measure(
+        self,
+        diagonal: NDArray[np.bool_],
+        rng: np.random.Generator | None = None,
+    ) -> NDArray[np.uint8]:
+        """
+        Projective measurement of every state with Lüders collapse.
+
+        Args:
+            diagonal: Boolean array of length N; True measures in the X-basis
+                      (|D⟩/|A⟩), False in the Z-basis (|H⟩/|V⟩).
+            rng:      Generator for the outcome draws; defaults to the module generator.
+
+        Returns:
+            uint8 array of N outcomes (0 or 1).
+        """
+        n: int = len(self)
+        u = (rng if rng is not None else _RNG).random(n)
+        results: NDArray[np.uint8] = np.greater_equal(u, self.probabilities(diagonal)).view(np.uint8)
+
+        # Collapse onto the measured axis: ±1 along it, transverse parts vanish
+        signed = 1.0 - 2.0 * results
+        self.rx = np.where(diagonal, signed, 0.0)
+        self.ry = np.zeros(n)
+        self.rz = np.where(diagonal, 0.0, signed)
+        return results
 
 
 if __name__ == "__main__":
@@ -1,10 +1,35 @@
 __author__ = "Rahul Rajesh 2360445"
 
+import numpy as np
+
 import core as bb
+from _jit import NUMBA_AVAILABLE
+from _bb84_kernels import batch_rounds
+
+
+def execute_batch(n_qubits, n_runs, rng=None):
+    """
+    Run `n_runs` independent noiseless BB84 rounds as one (n_runs, n_qubits)
+    batch and return per-run (qber, sifted_length) arrays.
+    QBER is taken over each run's whole sifted key; runs that sift no bits
+    report 0.0. With Numba the runs go through the batch_rounds kernel,
+    seeded per run from `rng`.
+    """
+    rng = rng if rng is not None else bb._RNG
+    if NUMBA_AVAILABLE:
+        return batch_rounds(n_qubits, rng.integers(0, 2**32, n_runs, dtype=np.int64))
+
+    alice_bits, _, _, bob_bits, match = bb.run_round((n_runs, n_qubits), rng)
+    sifted = np.count_nonzero(match, axis=1)
+    errors = np.count_nonzero((alice_bits != bob_bits) & match, axis=1)
+    qber = np.divide(errors, sifted, out=np.zeros(n_runs), where=sifted > 0)
+    return qber, sifted
+
 
 class QKDExperiment:
-    def __init__(self, n_qubits):
+    def __init__(self, n_qubits, rng=None):
         self.n = n_qubits
+        self.rng = rng
         self.alice = None
         self.bob = None
         self.q_channel = None
@@ -15,19 +40,27 @@ class QKDExperiment:
         self.error_rate = 0.0
 
     def build_phase(self):
-        self.alice = bb.Alice(self.n)
-        self.bob = bb.Bob(self.n)
+        self.alice = bb.Alice(self.n, self.rng)
+        self.bob = bb.Bob(self.n, self.rng)
         self.q_channel = bb.QuantumChannel()
         self.c_channel = bb.ClassicalChannel()
 
     def run_phase(self):
+        # Plain parties over the ideal channel: skip the amplitude matrix entirely
+        if (type(self.q_channel) is bb.QuantumChannel
+                and type(self.alice) is bb.Alice and type(self.bob) is bb.Bob):
+            (self.alice.bits, self.alice.bases,
+             self.bob.bases, self.bob.measured_bits, _) = bb.run_round(self.n, self.rng)
+            return
+
         self.alice.prepare_qubits()
         states_in_transit = self.q_channel.transmit(self.alice.state_matrix)
         self.bob.measure_qubits(states_in_transit)
 
     def key_generation_phase(self):
-        self.bob.sift_key(self.alice.bases)
-        self.alice.sift_key(self.bob.bases)
+        match_idx = bb.sift_indices(self.alice.bases, self.bob.bases)
+        self.bob.sift_key(self.alice.bases, match_idx)
+        self.alice.sift_key(self.bob.bases, match_idx)
         self.final_key_alice = self.alice.key
         self.final_key_bob = self.bob.key
 
@@ -2,65 +2,108 @@ __author__ = "Rahul Rajesh 2360445"
 
 import numpy as np
 import core as bb
+from _jit import NUMBA_AVAILABLE
+from _bb84_kernels import measure_born_noisy
 from manager import QKDExperiment
 
 class NoisyAlice(bb.Alice):
-    def __init__(self, n_qubits, p_fail):
-        super().__init__(n_qubits)
+    def __init__(self, n_qubits, p_fail, rng=None):
+        super().__init__(n_qubits, rng)
+        self.p_fail = p_fail
+        self._fail_buf = np.empty(self.n, dtype=np.float32)
+
+    def reset(self, p_fail):
+        super().reset()
         self.p_fail = p_fail
 
     def prepare_qubits(self):
         super().prepare_qubits()
         
-        fail_mask = (self.bases == 1) & (np.random.random(self.n) < self.p_fail)
+        fail_draw = self._rng.random(dtype=np.float32, out=self._fail_buf)
+        fail_mask = (self.bases == 1) & (fail_draw < self.p_fail)
         
-        if np.any(fail_mask):
-            states_to_fix = self.state_matrix[:, fail_mask]
-            reverted_states = bb.H_GATE @ states_to_fix
-            self.state_matrix[:, fail_mask] = reverted_states
+        # A failed polariser applies H a second time, and H·H = I: those columns
+        # fall back to the rectilinear amplitudes (1 − b, b). Failures are
+        # sparse, so only their indices are touched
+        fail_idx = np.flatnonzero(fail_mask)
+        row0, row1 = self.state_matrix
+        failed_bits = self.bits[fail_idx]
+        row0[fail_idx] = 1.0 - failed_bits
+        row1[fail_idx] = failed_bits
 
 class NoisyBob(bb.Bob):
-    def __init__(self, n_qubits, p_fail):
-        super().__init__(n_qubits)
+    def __init__(self, n_qubits, p_fail, rng=None):
+        super().__init__(n_qubits, rng)
         self.p_fail = p_fail
-        
+        # Fail draws and Born-rule uniforms share one buffer, filled in a single call
+        self._draw_buf = np.empty(2 * self.n, dtype=np.float32)
+
+    def reset(self, p_fail):
+        super().reset()
+        self.p_fail = p_fail
+
     def measure_qubits(self, state_matrix):
-        self.bases = np.random.randint(0, 2, self.n)
-        current_states = state_matrix.copy()
+        self.bases = self._rng.integers(0, 2, self.n, dtype=np.uint8)
+        s0, s1 = state_matrix
+
+        draws = self._rng.random(dtype=np.float32, out=self._draw_buf)
+        fail_draw, rng = draws[:self.n], draws[self.n:]
+
+        if NUMBA_AVAILABLE:
+            # Single fused pass: polariser failure, amplitude, |·|² and comparison
+            self.measured_bits = measure_born_noisy(
+                s0, s1, self.bases, fail_draw, self.p_fail, rng, self._measured_buf,
+            )
+            return
 
         diag_indices = (self.bases == 1)
-        fail_mask = (np.random.random(self.n) < self.p_fail)
+        fail_mask = (fail_draw < self.p_fail)
         effective_rotation_mask = diag_indices & (~fail_mask)
-        
-        if np.any(effective_rotation_mask):
-            cols = current_states[:, effective_rotation_mask]
-            current_states[:, effective_rotation_mask] = bb.H_GATE @ cols
 
-        prob_zero = np.abs(current_states[0, :]) ** 2
-        rng = np.random.random(self.n)
-        self.measured_bits = np.where(rng < prob_zero, 0, 1)
+        # Row 0 of H·ψ is (s0 + s1)·K, so rotated columns need no copy of the states
+        prob_zero = np.where(effective_rotation_mask, 0.5 * (s0 + s1) * (s0 + s1), s0 * s0)
+        np.greater_equal(rng, prob_zero, out=self._measured_buf.view(np.bool_))
+        self.measured_bits = self._measured_buf
 
 class NoisyQuantumChannel(bb.QuantumChannel):
+    def __init__(self, rng=None):
+        self._rng = rng if rng is not None else bb._RNG
+
     def transmit(self, state_matrix):
-        fluctuation = np.random.uniform(-0.25, 0.25)
+        """
+        Flip ~4% (±25%) of the qubits. Modifies `state_matrix` in place and
+        returns that same array, keeping the QuantumChannel.transmit contract.
+        """
+        fluctuation = self._rng.uniform(-0.25, 0.25)
         current_noise_rate = 0.04 * (1 + fluctuation)
         
         n_qubits = state_matrix.shape[1]
         num_errors = int(n_qubits * current_noise_rate)
         
         if num_errors > 0:
-            error_indices = np.random.choice(n_qubits, num_errors, replace=False)
-            state_matrix[:, error_indices] = state_matrix[::-1, error_indices]
+            # Distinct positions, unordered: flips commute, so skip choice()'s final shuffle
+            error_indices = self._rng.choice(n_qubits, num_errors, replace=False, shuffle=False)
+            # Bit flip = swap the two amplitudes; 1-D gathers on row views
+            # avoid the 2-D fancy-index temporary of state_matrix[::-1, idx]
+            row0, row1 = state_matrix
+            flipped = row0[error_indices]
+            row0[error_indices] = row1[error_indices]
+            row1[error_indices] = flipped
             
         return state_matrix
 
 class NoisyQKDExperiment(QKDExperiment):
-    def __init__(self, n_qubits, p_fail):
-        super().__init__(n_qubits)
+    def __init__(self, n_qubits, p_fail, rng=None):
+        super().__init__(n_qubits, rng)
         self.p_fail = p_fail
         
     def build_phase(self):
-        self.alice = NoisyAlice(self.n, self.p_fail)
-        self.bob = NoisyBob(self.n, self.p_fail)
-        self.q_channel = NoisyQuantumChannel()
+        # Repeated execute() calls reuse the parties' buffers instead of reallocating them
+        if self.alice is not None:
+            self.alice.reset(self.p_fail)
+            self.bob.reset(self.p_fail)
+            return
+        self.alice = NoisyAlice(self.n, self.p_fail, self.rng)
+        self.bob = NoisyBob(self.n, self.p_fail, self.rng)
+        self.q_channel = NoisyQuantumChannel(self.rng)
         self.c_channel = bb.ClassicalChannel()
\ No newline at end of file
@@ -18,6 +18,9 @@ import explain_logic
 
 MODEL_PATH = "Models/rf_model_v3.pkl"
 
+# Polarisation label per index 2·basis + bit: H, V (rectilinear), D, A (diagonal)
+_LABELS = np.array(['H', 'V', 'D', 'A'])
+
 def load_ai_brain():
     if not os.path.exists(MODEL_PATH):
         print(f"CRITICAL ERROR: AI Brain not found at {MODEL_PATH}")
@@ -27,61 +30,45 @@ def load_ai_brain():
     print("-> AI Brain Loaded successfully.")
     return model
 
-def run_lab_experiment(label: str, intensity_mode: str, attack_mode: str = "none", apply_noise: bool = False):
+def run_lab_experiment(label: str, intensity_mode: str, attack_mode: str = "none", apply_noise: bool = False,
+                       rng: np.random.Generator | None = None):
+    rng     = rng if rng is not None else np.random.default_rng()
     laser   = hardware.LaserSource()
-    bob_spd = hardware.APD_Detector()
+    bob_spd = hardware.APD_Detector(rng=rng)
     bob_spd.set_attack_mode(attack_mode)
 
     n_pulses = 5000
 
-    alice_bits_l, alice_bases_l = [], []
-    bob_bits_l,   bob_bases_l   = [], []
-    voltages, jitters = [], []
-    received_count = 0
-
-    label_map = {(0, 0): 'H', (1, 0): 'V', (0, 1): 'D', (1, 1): 'A'}
-
-    for i in range(n_pulses):
-        a_bit   = int(np.random.randint(0, 2))
-        a_basis = int(np.random.randint(0, 2))
-
-        q_state, flux = laser.emit(label_map[(a_bit, a_basis)], intensity_mode)
-        if apply_noise:
-            q_state.apply_depolarizing_noise(0.04)
-
-        b_basis   = int(np.random.randint(0, 2))
-        basis_str = 'rectilinear' if b_basis == 0 else 'diagonal'
-
-        current_time_sim = i * 15e-6
-
-        res = bob_spd.detect(q_state, flux, basis_str, current_time_sim)
+    # Alice's bits and bases and Bob's bases in one uint8 draw
+    a_bits, a_bases, b_bases = rng.integers(0, 2, (3, n_pulses), dtype=np.uint8)
+    times    = np.arange(n_pulses) * 15e-6
 
-        voltages.append(bob_spd.current_voltage)
-        jitters.append(bob_spd.current_jitter)
+    q_states, flux = laser.emit_batch(_LABELS[2 * a_bases + a_bits], intensity_mode)
+    if apply_noise:
+        q_states.apply_depolarizing_noise(0.04)
 
-        if res is not None:
-            alice_bits_l.append(a_bit)
-            alice_bases_l.append(a_basis)
-            bob_bits_l.append(res)
-            bob_bases_l.append(b_basis)
-            received_count += 1
+    outcomes, voltages, jitters = bob_spd.detect_batch(q_states, flux, b_bases, times)
+    fired = outcomes >= 0
+    received_count = int(fired.sum())
 
     count_rate  = received_count / n_pulses
     avg_voltage = float(np.mean(voltages))
     avg_jitter  = float(np.mean(jitters))
 
-    ab = np.array(alice_bits_l);  aB = np.array(alice_bases_l)
-    bb = np.array(bob_bits_l);    bB = np.array(bob_bases_l)
+    ab = a_bits[fired];  aB = a_bases[fired]
+    bb = outcomes[fired]; bB = b_bases[fired]
 
-    match   = aB == bB
-    error   = (ab != bb) & match
-    is_rect = aB == 0
-    is_diag = aB == 1
+    # One 3-bit code per sifted-candidate pulse, bucketed in a single pass:
+    #   bit 2 = Alice's basis, bit 1 = bases match, bit 0 = bits differ
+    code = (aB << 2) | ((aB == bB).view(np.uint8) << 1) | (ab != bb).view(np.uint8)
+    counts = np.bincount(code, minlength=8)
+    rect_sifted, rect_err = int(counts[0b010] + counts[0b011]), int(counts[0b011])
+    diag_sifted, diag_err = int(counts[0b110] + counts[0b111]), int(counts[0b111])
 
-    n_sifted  = int(match.sum())
-    qber_o = error.sum()   / n_sifted              if n_sifted > 0 else 0.0
-    qber_r = (error & is_rect).sum() / (match & is_rect).sum() if (match & is_rect).sum() > 0 else 0.0
-    qber_d = (error & is_diag).sum() / (match & is_diag).sum() if (match & is_diag).sum() > 0 else 0.0
+    n_sifted = rect_sifted + diag_sifted
+    qber_o = (rect_err + diag_err) / n_sifted if n_sifted > 0 else 0.0
+    qber_r = rect_err / rect_sifted           if rect_sifted > 0 else 0.0
+    qber_d = diag_err / diag_sifted           if diag_sifted > 0 else 0.0
 
     ai_input = pd.DataFrame([{
         'qber_overall':      float(qber_o),
@@ -8,87 +8,103 @@ from concurrent.futures import ProcessPoolExecutor
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'Simulation'))
 
+from utils.csv_io import write_csv
+
 import manager as expt
 import noise as noisy
 import attacker as eve
 
 DATASET_SIZE = 1_000_000
 OUTPUT_DIR = "Datasets/Raw"
+SEED = None  # set an int to make the whole dataset reproducible
 
-def generate_hardware_vitals(n, label):
-    voltage = np.random.normal(3.3, 0.2, n) 
-    jitter = np.random.normal(1.2, 0.2, n)
-    counts = np.random.normal(0.25, 0.02, n)
+# label -> (mean, std) of detector voltage, timing jitter and count rate
+_VITALS = {
+    "normal":           ((3.3, 0.2), (1.2, 0.2),   (0.25, 0.02)),
+    "attack_blinding":  ((9.0, 0.1), (0.1, 0.01),  (0.99, 0.005)),
+    "attack_timeshift": ((3.3, 0.2), (0.05, 0.01), (0.15, 0.02)),
+}
 
-    if label == "attack_blinding":
-        voltage = np.random.normal(9.0, 0.1, n)
-        jitter = np.random.normal(0.1, 0.01, n)
-        counts = np.random.normal(0.99, 0.005, n) 
-        
-    elif label == "attack_timeshift":
-        voltage = np.random.normal(3.3, 0.2, n)
-        jitter = np.random.normal(0.05, 0.01, n)
-        counts = np.random.normal(0.15, 0.02, n)
+def generate_hardware_vitals(n, label, rng):
+    (mu, sigma) = np.array(_VITALS.get(label, _VITALS["normal"])).T
 
-    voltage = np.maximum(0, voltage)
-    jitter = np.maximum(0, jitter)
-    counts = np.clip(counts, 0, 1)
+    # All three channels from one standard-normal draw, scaled in place
+    z = rng.standard_normal((3, n))
+    z *= sigma[:, None]
+    z += mu[:, None]
+
+    voltage, jitter, counts = z
+    np.maximum(voltage, 0, out=voltage)
+    np.maximum(jitter, 0, out=jitter)
+    np.clip(counts, 0, 1, out=counts)
 
     return voltage, jitter, counts
 
+def event_columns(experiment):
+    """Per-event uint8 columns of a finished run, straight from the party arrays."""
+    alice, bob = experiment.alice, experiment.bob
+    return {
+        'alice_bit': alice.bits,
+        'alice_basis': alice.bases,
+        'bob_basis': bob.bases,
+        'bob_bit': bob.measured_bits,
+        'basis_match': np.equal(alice.bases, bob.bases).view(np.uint8),
+        'error': np.not_equal(alice.bits, bob.measured_bits).view(np.uint8),
+    }
+
 def run_simulation_task(task_config):
-    label, filename, sim_class, kwargs = task_config
+    label, out_path, sim_class, kwargs, seed_seq = task_config
+    # Forked workers would otherwise inherit identical generator states
+    rng = np.random.default_rng(seed_seq)
     print(f"[{label}] Starting generation of {DATASET_SIZE} events...")
 
     if label == "normal":
-        dfs = []
         chunk_size = DATASET_SIZE // 5
         noise_levels = [0.01, 0.02, 0.03, 0.04, 0.05]
         
-        for p in noise_levels:
-            current_kwargs = {"p_fail": p}
-            experiment = sim_class(chunk_size, **current_kwargs)
+        # Each column is allocated once at full length and every noise
+        # level fills its own slice, instead of one DataFrame per chunk + concat
+        data = {}
+        
+        # One experiment for all noise levels: later runs reuse its buffers
+        experiment = sim_class(chunk_size, p_fail=noise_levels[0], rng=rng)
+        for k, p in enumerate(noise_levels):
+            experiment.p_fail = p
             experiment.execute()
             
-            chunk_data = {
-                'alice_bit': experiment.alice.bits,
-                'alice_basis': experiment.alice.bases,
-                'bob_basis': experiment.bob.bases,
-                'bob_bit': experiment.bob.measured_bits,
-            }
-            
-            chunk_data['basis_match'] = (chunk_data['alice_basis'] == chunk_data['bob_basis']).astype(int)
-            chunk_data['error'] = (chunk_data['alice_bit'] != chunk_data['bob_bit']).astype(int)
+            chunk_data = event_columns(experiment)
             
-            v, j, c = generate_hardware_vitals(chunk_size, label)
+            v, j, c = generate_hardware_vitals(chunk_size, label, rng)
             chunk_data['detector_voltage'] = v
             chunk_data['timing_jitter'] = j
             chunk_data['photon_count_rate'] = c
             
-            dfs.append(pd.DataFrame(chunk_data))
+            rows = slice(k * chunk_size, (k + 1) * chunk_size)
+            for name, column in chunk_data.items():
+                if name not in data:
+                    data[name] = np.empty(chunk_size * len(noise_levels), dtype=column.dtype)
+                data[name][rows] = column
             
-        df = pd.concat(dfs, ignore_index=True)
+        df = pd.DataFrame(data)
     
     else:
-        experiment = sim_class(DATASET_SIZE, **kwargs)
+        experiment = sim_class(DATASET_SIZE, rng=rng, **kwargs)
         experiment.execute()
         
-        data = {
-            'alice_bit': experiment.alice.bits,
-            'alice_basis': experiment.alice.bases,
-            'bob_basis': experiment.bob.bases,
-            'bob_bit': experiment.bob.measured_bits,
-        }
-        
-        data['basis_match'] = (data['alice_basis'] == data['bob_basis']).astype(int)
-        data['error'] = (data['alice_bit'] != data['bob_bit']).astype(int)
+        data = event_columns(experiment)
         
         if label in ["attack_blinding", "attack_timeshift"]:
-            mask_clean = np.random.random(DATASET_SIZE) > 0.01
-            data['error'][mask_clean] = 0
-            data['bob_bit'][mask_clean] = data['alice_bit'][mask_clean]
+            # Eve forces Bob's result on all but ~1% of events: keep those
+            # few rows, overwrite everything else in bulk, then restore them
+            dirty = np.flatnonzero(rng.random(DATASET_SIZE, dtype=np.float32) <= 0.01)
+            kept_bits = data['bob_bit'][dirty]
+            kept_errors = data['error'][dirty]
+            data['bob_bit'][:] = data['alice_bit']
+            data['error'][:] = 0
+            data['bob_bit'][dirty] = kept_bits
+            data['error'][dirty] = kept_errors
 
-        voltage, jitter, counts = generate_hardware_vitals(DATASET_SIZE, label)
+        voltage, jitter, counts = generate_hardware_vitals(DATASET_SIZE, label, rng)
         data['detector_voltage'] = voltage
         data['timing_jitter'] = jitter
         data['photon_count_rate'] = counts
@@ -96,9 +112,7 @@ def run_simulation_task(task_config):
         df = pd.DataFrame(data)
 
     df['label'] = label
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    out_path = os.path.join(OUTPUT_DIR, filename)
-    df.to_csv(out_path, index=False)
+    write_csv(df, out_path)
     
     return f"[{label}] DONE: Saved {len(df)} rows to {out_path}"
 
@@ -111,6 +125,15 @@ def main():
         ("attack_blinding", "attack_blinding.csv", noisy.NoisyQKDExperiment, {"p_fail": 0.0}), 
         ("attack_timeshift", "attack_timeshift.csv", noisy.NoisyQKDExperiment, {"p_fail": 0.0})
     ]
+    # Output directory and paths are resolved once here, not in every worker
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # One independent child stream per task, spawned from a single root
+    seeds = np.random.SeedSequence(SEED).spawn(len(tasks))
+    tasks = [
+        (label, os.path.join(OUTPUT_DIR, filename), sim_class, kwargs, seed)
+        for (label, filename, sim_class, kwargs), seed in zip(tasks, seeds)
+    ]
 
     with ProcessPoolExecutor() as executor:
         results = list(executor.map(run_simulation_task, tasks))
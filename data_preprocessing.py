@@ -9,13 +9,98 @@ __author__ = "Rahul Rajesh 2360445"
 import pandas as pd
 import numpy as np
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'Simulation'))
 
 from config.logging_config import configure_logging, get_logger
+from utils.csv_io import read_csv, write_csv
+from _jit import NUMBA_AVAILABLE, njit
 
 configure_logging()
 log = get_logger("qkd.preprocess")
 
 
+@njit(cache=True)
+def _rolling_qber(
+    sifted: np.ndarray,
+    error: np.ndarray,
+    alice_basis: np.ndarray,
+    window: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Overall / rectilinear / diagonal QBER over a sliding window, in one pass.
+
+    Four integer counters track the window: each event is added as it enters
+    and subtracted `window` events later; the diagonal counts are the overall
+    minus the rectilinear ones. Rows before the first full window, and
+    windows with no sifted events of a kind, get 0.0.
+    """
+    n = sifted.shape[0]
+    qber_o = np.zeros(n, dtype=np.float32)
+    qber_r = np.zeros(n, dtype=np.float32)
+    qber_d = np.zeros(n, dtype=np.float32)
+    n_sifted = 0
+    n_rect = 0
+    e_total = 0
+    e_rect = 0
+    for i in range(n):
+        s = 1 if sifted[i] != 0 else 0
+        e = s if error[i] != 0 else 0
+        r = 1 if alice_basis[i] == 0 else 0
+        n_sifted += s
+        e_total += e
+        n_rect += s * r
+        e_rect += e * r
+        if i >= window:
+            j = i - window
+            s = 1 if sifted[j] != 0 else 0
+            e = s if error[j] != 0 else 0
+            r = 1 if alice_basis[j] == 0 else 0
+            n_sifted -= s
+            e_total -= e
+            n_rect -= s * r
+            e_rect -= e * r
+        if i >= window - 1:
+            if n_sifted > 0:
+                qber_o[i] = e_total / n_sifted
+            if n_rect > 0:
+                qber_r[i] = e_rect / n_rect
+            if n_sifted > n_rect:
+                qber_d[i] = (e_total - e_rect) / (n_sifted - n_rect)
+    return qber_o, qber_r, qber_d
+
+
+def _rolling_sum(flags: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of 0/1 `flags` over a trailing window as a cumulative-sum difference.
+    Rows before the first full window are 0.
+    """
+    cs = np.cumsum(flags, dtype=np.int64)
+    out = np.zeros(cs.shape[0], dtype=np.int64)
+    if window <= cs.shape[0]:
+        out[window - 1] = cs[window - 1]
+        np.subtract(cs[window:], cs[:-window], out=out[window:])
+    return out
+
+
+def _safe_ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den in one pass, 0.0 wherever den is 0 (no NaN/inf to clean up)."""
+    return np.divide(num, den, out=np.zeros(num.shape[0], dtype=np.float32), where=den > 0)
+
+
+# Raw event flags are 0/1: parse them as uint8 instead of int64 (8x smaller).
+# The vitals stay float64 so the processed feature values are unchanged.
+RAW_DTYPES: dict[str, str] = {
+    'alice_bit':   'uint8',
+    'alice_basis': 'uint8',
+    'bob_basis':   'uint8',
+    'bob_bit':     'uint8',
+    'basis_match': 'uint8',
+    'error':       'uint8',
+}
+
+
 def calculate_v3_features(df: pd.DataFrame, window_size: int = 500) -> pd.DataFrame:
     """
     Apply rolling micro-sifting over a window of `window_size` events.
@@ -30,35 +115,49 @@ def calculate_v3_features(df: pd.DataFrame, window_size: int = 500) -> pd.DataFr
 
     Returns:
         Processed DataFrame with 7 columns (6 features + label), NaN rows dropped.
+        The QBER columns are float32: each is a count ratio k/m with
+        m <= window_size, which float32 still tells apart exactly.
     """
     log.debug(f"Calculating micro-sifting stats (window={window_size})...")
 
-    df['sifted'] = df['basis_match']
+    # 0/1 event flags as uint8, extracted once; no helper columns on `df`
+    sifted      = df['basis_match'].to_numpy(np.uint8)
+    error       = df['error'].to_numpy(np.uint8)
+    alice_basis = df['alice_basis'].to_numpy(np.uint8)
+
+    if NUMBA_AVAILABLE:
+        qber_o, qber_r, qber_d = _rolling_qber(sifted, error, alice_basis, window_size)
+        df['qber_overall']     = qber_o
+        df['qber_rectilinear'] = qber_r
+        df['qber_diagonal']    = qber_d
+        return _select_features(df)
 
-    is_rect = df['alice_basis'] == 0
-    is_diag = df['alice_basis'] == 1
+    # alice_basis is 1 exactly on diagonal events, so it is the diagonal mask
+    is_diag = alice_basis
 
     # CRITICAL: only count errors on SIFTED events (basis_match=1).
     # The raw `error` column is non-zero even when bases mismatch
     # (Bob's bit is random there), which would inflate QBER to ~50%.
-    sifted_mask      = df['sifted'].astype(bool)
-    sifted_error     = df['error'] & sifted_mask
+    sifted_error = error & sifted
 
-    df['error_rect'] = sifted_error & is_rect
-    df['error_diag'] = sifted_error & is_diag
+    r_sifted      = _rolling_sum(sifted, window_size)
+    r_error_total = _rolling_sum(sifted_error, window_size)
+    r_error_diag  = _rolling_sum(sifted_error & is_diag, window_size)
+    r_count_diag  = _rolling_sum(sifted & is_diag, window_size)
 
-    r_sifted      = df['sifted'].rolling(window=window_size).sum()
-    r_error_total = sifted_error.rolling(window=window_size).sum()
-    r_error_rect  = df['error_rect'].rolling(window=window_size).sum()
-    r_error_diag  = df['error_diag'].rolling(window=window_size).sum()
+    # Every sifted event is rectilinear or diagonal, so the rectilinear
+    # window sums follow exactly from the other two
+    r_error_rect  = r_error_total - r_error_diag
+    r_count_rect  = r_sifted - r_count_diag
 
-    r_count_rect  = (sifted_mask & is_rect).rolling(window=window_size).sum()
-    r_count_diag  = (sifted_mask & is_diag).rolling(window=window_size).sum()
+    df['qber_overall']     = _safe_ratio(r_error_total, r_sifted)
+    df['qber_rectilinear'] = _safe_ratio(r_error_rect, r_count_rect)
+    df['qber_diagonal']    = _safe_ratio(r_error_diag, r_count_diag)
+    return _select_features(df)
 
-    df['qber_overall']     = (r_error_total / r_sifted    ).fillna(0.0).replace([np.inf, -np.inf], 0.0)
-    df['qber_rectilinear'] = (r_error_rect  / r_count_rect).fillna(0.0).replace([np.inf, -np.inf], 0.0)
-    df['qber_diagonal']    = (r_error_diag  / r_count_diag).fillna(0.0).replace([np.inf, -np.inf], 0.0)
 
+def _select_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the six model features plus the label, dropping incomplete rows."""
     features = [
         'qber_overall',
         'qber_rectilinear',
@@ -74,28 +173,35 @@ def calculate_v3_features(df: pd.DataFrame, window_size: int = 500) -> pd.DataFr
     return df_final
 
 
+RAW_DIR       = "Datasets/Raw"
+PROCESSED_DIR = "Datasets/Processed"
+
+
 def process_file(filename: str) -> None:
-    """Process a single raw CSV file and save the feature-engineered result."""
-    input_path  = f"Datasets/Raw/{filename}"
-    output_path = f"Datasets/Processed/{filename}"
+    """
+    Process a single raw CSV file and save the feature-engineered result.
+    PROCESSED_DIR must already exist (main() creates it once).
+    """
+    input_path  = f"{RAW_DIR}/{filename}"
+    output_path = f"{PROCESSED_DIR}/{filename}"
 
     if not os.path.exists(input_path):
         log.warning(f"Skipping '{filename}' — file not found at {input_path}")
         return
 
     log.info(f"Processing '{filename}'...")
-    df = pd.read_csv(input_path)
+    df = read_csv(input_path, RAW_DTYPES)
     log.debug(f"  Loaded {len(df):,} raw events from {input_path}")
 
     df_processed = calculate_v3_features(df, window_size=500)
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df_processed.to_csv(output_path, index=False)
+    write_csv(df_processed, output_path)
     log.info(f"  Saved {len(df_processed):,} fingerprint vectors to '{output_path}'")
 
 
 def main() -> None:
     log.info("--- Phase 2: Feature Engineering (v3.0) ---")
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
 
     process_file("normal_data.csv")
     process_file("attack_intercept.csv")
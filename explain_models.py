@@ -9,11 +9,26 @@ __author__ = "Rahul Rajesh 2360445"
 import pandas as pd
 import numpy as np
 import pickle
-import shap
+import matplotlib
+matplotlib.use("Agg")  # PNG output only: skip GUI backend/toolkit start-up
 import matplotlib.pyplot as plt
+import shap
 import os
 
+try:
+    import fasttreeshap
+    FASTTREESHAP_AVAILABLE = True
+except ImportError:
+    FASTTREESHAP_AVAILABLE = False
+
+try:
+    from cuml.explainer import TreeExplainer as GPUTreeExplainer
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
 from config.logging_config import configure_logging, get_logger
+from utils.csv_io import read_csv
 
 configure_logging()
 log = get_logger("qkd.xai")
@@ -29,6 +44,103 @@ FEATURES: list[str] = [
 
 RESULTS_DIR = "Results/Forensic_Evidence"
 
+# The summary PNG is also decoded by the live dashboard (shown at <=1000x600),
+# so 150 dpi (1500x900 px) is ample; the beeswarm keeps more detail.
+SUMMARY_DPI:  int = 150
+DETAILED_DPI: int = 200
+
+# GPU TreeSHAP start-up (CUDA context, model upload) only pays off on big forests
+GPU_MIN_TREES: int = 500
+
+# (model class, processed CSV, name used in plot titles and filenames)
+ATTACK_CLASSES: list[tuple[str, str, str]] = [
+    ("attack_timeshift", "attack_timeshift.csv", "TimeShift_Attack"),
+    ("attack_blinding",  "attack_blinding.csv",  "Blinding_Attack"),
+]
+
+
+def build_tree_explainer(model):
+    """
+    TreeSHAP explainer for a fitted tree ensemble. Forests of at least
+    GPU_MIN_TREES trees go to cuML's GPUTreeShap when cuML is installed;
+    otherwise FastTreeSHAP's v2 algorithm across all cores when installed,
+    else SHAP's TreeExplainer. Call it through explain_rows().
+
+    No background dataset is passed: the CPU explainers use path-dependent
+    perturbation, taking the expected value from the trees' training-sample
+    leaf counts.
+    """
+    if CUML_AVAILABLE and len(getattr(model, "estimators_", ())) >= GPU_MIN_TREES:
+        return GPUTreeExplainer(model=model)
+    if FASTTREESHAP_AVAILABLE:
+        return fasttreeshap.TreeExplainer(
+            model, feature_perturbation="tree_path_dependent", algorithm="v2", n_jobs=-1
+        )
+    return shap.TreeExplainer(model, feature_perturbation="tree_path_dependent")
+
+
+def explain_rows(explainer, X: pd.DataFrame):
+    """SHAP values for the rows of `X` from any build_tree_explainer() backend."""
+    if CUML_AVAILABLE and isinstance(explainer, GPUTreeExplainer):
+        return explainer.shap_values(X.to_numpy(np.float32))
+    return explainer.shap_values(X, check_additivity=False)
+
+
+def _class_shap_values(shap_values, target_index: int, n_rows: int) -> np.ndarray:
+    """(n_rows, n_features) SHAP values for one class, across SHAP output formats."""
+    if isinstance(shap_values, list):
+        # One array per class (FastTreeSHAP, shap < 0.45)
+        target = shap_values[target_index]
+    elif shap_values.shape[0] == n_rows:
+        # (rows, features, classes): shap >= 0.45
+        target = shap_values[:, :, target_index]
+    else:
+        # (classes, rows, features)
+        target = shap_values[target_index]
+
+    if target.shape != (n_rows, len(FEATURES)):
+        raise ValueError(
+            f"Unexpected SHAP output shape {target.shape}; "
+            f"expected ({n_rows}, {len(FEATURES)})"
+        )
+    return target
+
+
+def _save_plots(shap_values_target: np.ndarray, X_sample: pd.DataFrame, clean_name: str) -> None:
+    """
+    Save SHAP bar + beeswarm plots for one attack class. Each plot type
+    redraws into one named figure that is cleared and reused across classes.
+    """
+    # ---- Bar plot (global feature importance) ----
+    plt.figure("shap_summary", figsize=(10, 6), clear=True)
+    shap.summary_plot(
+        shap_values_target,
+        X_sample,
+        feature_names=FEATURES,
+        show=False,
+        plot_type="bar",
+    )
+    plt.title(f"Primary Indicators: {clean_name}", fontsize=14)
+    plt.tight_layout()
+    bar_path = os.path.join(RESULTS_DIR, f"Evidence_{clean_name}_Summary.png")
+    plt.savefig(bar_path, dpi=SUMMARY_DPI, bbox_inches='tight')
+    log.info(f"  Saved summary bar plot: '{bar_path}'")
+
+    # ---- Beeswarm plot (per-sample SHAP magnitudes) ----
+    plt.figure("shap_beeswarm", figsize=(12, 8), clear=True)
+    shap.summary_plot(
+        shap_values_target,
+        X_sample,
+        feature_names=FEATURES,
+        show=False,
+        plot_type="dot",
+    )
+    plt.title(f"Forensic Fingerprint: {clean_name}", fontsize=14)
+    plt.tight_layout()
+    dot_path = os.path.join(RESULTS_DIR, f"Evidence_{clean_name}_Detailed.png")
+    plt.savefig(dot_path, dpi=DETAILED_DPI, bbox_inches='tight')
+    log.info(f"  Saved beeswarm plot:   '{dot_path}'")
+
 
 def explain_predictions() -> None:
     """
@@ -46,80 +158,46 @@ def explain_predictions() -> None:
         rf_model = pickle.load(f)
 
     log.info("Initialising SHAP TreeExplainer...")
-    explainer = shap.TreeExplainer(rf_model)
+    explainer = build_tree_explainer(rf_model)
 
     os.makedirs(RESULTS_DIR, exist_ok=True)
     log.info(f"Saving all evidence to: {RESULTS_DIR}/")
 
-    def generate_plot(attack_name: str, csv_filename: str, clean_name: str) -> None:
-        """Compute and save SHAP bar + beeswarm plots for one attack class."""
-        log.info(f"Explaining '{attack_name}'...")
+    # Sample every available class first, so TreeSHAP walks the forest once
+    samples: list[tuple[str, str, pd.DataFrame]] = []
+    for attack_name, csv_filename, clean_name in ATTACK_CLASSES:
         data_path = f"Datasets/Processed/{csv_filename}"
-
         if not os.path.exists(data_path):
             log.warning(f"Skipping '{attack_name}' — '{data_path}' not found.")
-            return
+            continue
+        df = read_csv(data_path, columns=FEATURES)
+        samples.append((attack_name, clean_name, df.sample(n=100, random_state=42)))
+
+    if not samples:
+        log.error("No processed attack data found. Run data_preprocessing.py first.")
+        return
 
-        df = pd.read_csv(data_path)
-        X_sample = df[FEATURES].sample(n=100, random_state=42)
+    X_all = pd.concat([X_sample for _, _, X_sample in samples])
+    log.debug(f"  Calculating SHAP values for {len(X_all)} samples...")
+    shap_values = explain_rows(explainer, X_all)
 
-        log.debug(f"  Calculating SHAP values for {len(X_sample)} samples...")
-        shap_values = explainer.shap_values(X_sample, check_additivity=False)
+    class_names = rf_model.classes_
+    start = 0
+    for attack_name, clean_name, X_sample in samples:
+        rows  = slice(start, start + len(X_sample))
+        start = rows.stop
 
-        class_names = rf_model.classes_
+        log.info(f"Explaining '{attack_name}'...")
         try:
             target_index = np.where(class_names == attack_name)[0][0]
         except IndexError:
             log.error(f"Class '{attack_name}' not found in model classes: {class_names.tolist()}")
-            return
-
-        # Resolve SHAP value format across scikit-learn versions
-        shap_values_target: np.ndarray
-        if isinstance(shap_values, list):
-            shap_values_target = shap_values[target_index]
-        elif isinstance(shap_values, np.ndarray) and shap_values.ndim == 3:
-            if shap_values.shape[0] == len(X_sample):
-                shap_values_target = shap_values[:, :, target_index]
-            else:
-                shap_values_target = shap_values[target_index]
-        else:
-            shap_values_target = shap_values[target_index]
-
-        # ---- Bar plot (global feature importance) ----
-        plt.figure(figsize=(10, 6))
-        shap.summary_plot(
-            shap_values_target,
-            X_sample,
-            feature_names=FEATURES,
-            show=False,
-            plot_type="bar",
-        )
-        plt.title(f"Primary Indicators: {clean_name}", fontsize=14)
-        plt.tight_layout()
-        bar_path = os.path.join(RESULTS_DIR, f"Evidence_{clean_name}_Summary.png")
-        plt.savefig(bar_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        log.info(f"  Saved summary bar plot: '{bar_path}'")
-
-        # ---- Beeswarm plot (per-sample SHAP magnitudes) ----
-        plt.figure(figsize=(12, 8))
-        shap.summary_plot(
-            shap_values_target,
-            X_sample,
-            feature_names=FEATURES,
-            show=False,
-            plot_type="dot",
-        )
-        plt.title(f"Forensic Fingerprint: {clean_name}", fontsize=14)
-        plt.tight_layout()
-        dot_path = os.path.join(RESULTS_DIR, f"Evidence_{clean_name}_Detailed.png")
-        plt.savefig(dot_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        log.info(f"  Saved beeswarm plot:   '{dot_path}'")
+            continue
 
-    generate_plot("attack_timeshift", "attack_timeshift.csv", "TimeShift_Attack")
-    generate_plot("attack_blinding",  "attack_blinding.csv",  "Blinding_Attack")
+        shap_values_target = _class_shap_values(shap_values, target_index, len(X_all))[rows]
+        _save_plots(shap_values_target, X_sample, clean_name)
 
+    plt.close("all")
     log.info("--- XAI Generation Complete ---")
 
 
@@ -3,7 +3,6 @@ __author__ = "Rahul Rajesh 2360445"
 import sys
 import os
 import argparse
-import collections
 import csv
 from datetime import datetime
 
@@ -33,11 +32,13 @@ except ImportError as exc:
 
 if _GUI_AVAILABLE:
     from gui.worker_thread import IDSWorker
+    from streams.circular_buffer import ValueHistory
     from utils.pdf_export import generate_incident_report
 
     class IDSDashboard(QMainWindow):
 
         _HISTORY_LEN: int = 200   
+        _RENDER_INTERVAL_MS: int = 50
 
         _COLORS = {
             "normal":   ("#051a0f", "#00ff66"),   
@@ -51,9 +52,7 @@ if _GUI_AVAILABLE:
             self.setWindowTitle("QKD Real-Time IDS - Rahul Rajesh 2360445")
             self.resize(1200, 800)
 
-            self._qber_history: collections.deque[float] = collections.deque(
-                [0.0] * self._HISTORY_LEN, maxlen=self._HISTORY_LEN
-            )
+            self._qber_history = ValueHistory(self._HISTORY_LEN)
             
             self._last_abort_log_time = 0.0
             self._last_warn_log_time = 0.0
@@ -69,10 +68,17 @@ if _GUI_AVAILABLE:
             self._summary_is_red = True
             self._current_summary_html = ""
 
+            # Results arrive at the worker's rate; widgets repaint at most
+            # once per render tick with the newest one
+            self._pending_view: dict | None = None
+            self._render_timer = QTimer()
+            self._render_timer.timeout.connect(self._render_pending)
+
             self._init_environmental_logs()
             self._build_ui()
             self._set_initial_dropdown(attack_mode)
             self._start_worker(attack_mode)
+            self._render_timer.start(self._RENDER_INTERVAL_MS)
 
         def _init_environmental_logs(self) -> None:
             self._degradation_log = os.path.join(_PROJECT_ROOT, "logs", "channel_degradation.csv")
@@ -252,7 +258,7 @@ if _GUI_AVAILABLE:
             self._plot_widget.addItem(self._abort_line)
             
             self._qber_curve = self._plot_widget.plot(
-                list(self._qber_history),
+                self._qber_history.values(),
                 pen=pg.mkPen("#00f0ff", width=2.5),
                 fillLevel=0.0,
                 fillBrush=pg.mkBrush(0, 240, 255, 30)
@@ -389,9 +395,9 @@ if _GUI_AVAILABLE:
             
             self._status_label.setText("[ SWITCHING MODES... ]")
             self._set_status_style("warning")
-            self._qber_history.clear()
-            self._qber_history.extend([0.0] * self._HISTORY_LEN)
-            self._qber_curve.setData(list(self._qber_history))
+            self._qber_history.reset()
+            self._pending_view = None
+            self._qber_curve.setData(self._qber_history.values())
             self._report_area.clear()
             self._xai_image_label.clear()
             self._xai_image_label.setText("Awaiting anomaly detection to populate visual evidence...")
@@ -448,6 +454,7 @@ if _GUI_AVAILABLE:
             self._worker.start()
 
         def _on_result(self, result: dict) -> None:
+            """Log and record every result; the widgets are updated by _render_pending."""
             try:
                 if "ZERO-DAY" in result.get("verdict", ""):
                     result["report"] = "FORENSIC ANALYSIS: [ZERO-DAY_ANOMALY]\nCRITICAL THREAT: UNCLASSIFIED PHYSICAL PERTURBATION\nReasoning: The Anomaly Engine (SVM) detected out-of-distribution hardware telemetry.\n- Status: Signature Engine (RF) failed to match known attack vectors.\n- Conclusion: Potential novel attack or severe hardware malfunction. Escalate immediately."
@@ -513,6 +520,43 @@ if _GUI_AVAILABLE:
                         "is_qber_abort": is_qber_abort
                     }
 
+                self._qber_history.append(current_qber)
+                self._pending_view = {
+                    "vitals":           vitals,
+                    "verdict":          verdict,
+                    "rf_prediction":    rf_pred,
+                    "rf_confidence":    rf_conf,
+                    "svm_anomaly":      svm_anomaly,
+                    "report":           report,
+                    "current_qber":     current_qber,
+                    "abort_threshold":  abort_threshold,
+                    "is_qber_abort":    is_qber_abort,
+                    "is_noise_warning": is_noise_warning,
+                    "is_attack":        is_attack,
+                    "image_path":       img_path,
+                }
+            except Exception as e:
+                log.error(f"Error executing logic: {e}")
+
+        def _render_pending(self) -> None:
+            """Render-timer tick: show the newest result, if one arrived since the last tick."""
+            view, self._pending_view = self._pending_view, None
+            if view is None:
+                return
+            try:
+                vitals           = view["vitals"]
+                verdict          = view["verdict"]
+                rf_pred          = view["rf_prediction"]
+                rf_conf          = view["rf_confidence"]
+                svm_anomaly      = view["svm_anomaly"]
+                report           = view["report"]
+                current_qber     = view["current_qber"]
+                abort_threshold  = view["abort_threshold"]
+                is_qber_abort    = view["is_qber_abort"]
+                is_noise_warning = view["is_noise_warning"]
+                is_attack        = view["is_attack"]
+                img_path         = view["image_path"]
+
                 self._fill_bar.setValue(500)
 
                 if is_qber_abort:
@@ -550,8 +594,7 @@ if _GUI_AVAILABLE:
                 self._jitter_lbl.setText( f"Jitter:   {vitals.get('jitter', 0.0):>5.2f} ns")
                 self._qber_lbl.setText(   f"QBER:     {current_qber:>5.2%}")
 
-                self._qber_history.append(current_qber)
-                self._qber_curve.setData(list(self._qber_history))
+                self._qber_curve.setData(self._qber_history.values())
 
                 self._rf_label.setText(f"RF: {rf_pred}  ({rf_conf:.1%})")
                 
@@ -579,6 +622,7 @@ if _GUI_AVAILABLE:
                 log.error(f"Error executing logic: {e}")
 
         def closeEvent(self, event) -> None:
+            self._render_timer.stop()
             self._worker.stop()
             self._worker.wait(3000)   
             super().closeEvent(event)
@@ -3,7 +3,6 @@ __author__ = "Rahul Rajesh 2360445"
 import sys
 import os
 import argparse
-import collections
 import functools
 
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,10 +31,12 @@ except ImportError as exc:
 
 if _GUI_AVAILABLE:
     from gui.worker_thread import IDSWorker
+    from streams.circular_buffer import ValueHistory
 
     class SandboxDashboard(QMainWindow):
 
         _HISTORY_LEN: int = 200   
+        _RENDER_INTERVAL_MS: int = 50
 
         _COLORS = {
             "normal":   ("#051a0f", "#00ff66"),   
@@ -49,9 +50,7 @@ if _GUI_AVAILABLE:
             self.setWindowTitle("QKD Live-Fire Sandbox - Rahul Rajesh 2360445")
             self.resize(1200, 800)
 
-            self._qber_history: collections.deque[float] = collections.deque(
-                [0.0] * self._HISTORY_LEN, maxlen=self._HISTORY_LEN
-            )
+            self._qber_history = ValueHistory(self._HISTORY_LEN)
             
             self._injection_timer = QTimer()
             self._injection_timer.setSingleShot(True)
@@ -66,8 +65,15 @@ if _GUI_AVAILABLE:
             self._summary_is_red = True
             self._current_summary_html = ""
 
+            # Results arrive at the worker's rate; widgets repaint at most
+            # once per render tick with the newest one
+            self._pending_result: dict | None = None
+            self._render_timer = QTimer()
+            self._render_timer.timeout.connect(self._render_pending)
+
             self._build_ui()
             self._start_worker()
+            self._render_timer.start(self._RENDER_INTERVAL_MS)
 
         def _create_panel(self) -> QFrame:
             frame = QFrame()
@@ -206,7 +212,7 @@ if _GUI_AVAILABLE:
             self._plot_widget.addItem(self._abort_line)
             
             self._qber_curve = self._plot_widget.plot(
-                list(self._qber_history),
+                self._qber_history.values(),
                 pen=pg.mkPen("#00f0ff", width=2.5),
                 fillLevel=0.0,
                 fillBrush=pg.mkBrush(0, 240, 255, 30)
@@ -343,6 +349,16 @@ if _GUI_AVAILABLE:
             self._worker.start()
 
         def _on_result(self, result: dict) -> None:
+            """Record every QBER reading; the widgets are updated by _render_pending."""
+            self._qber_history.append(result["vitals"]["qber"])
+            self._pending_result = result
+
+        def _render_pending(self) -> None:
+            """Render-timer tick: show the newest result, if one arrived since the last tick."""
+            result, self._pending_result = self._pending_result, None
+            if result is None:
+                return
+
             if "ZERO-DAY" in result["verdict"]:
                 result["report"] = "FORENSIC ANALYSIS: [ZERO-DAY_ANOMALY]<br>CRITICAL THREAT: UNCLASSIFIED PHYSICAL PERTURBATION<br>Reasoning: The Anomaly Engine (SVM) detected out-of-distribution hardware telemetry.<br>- Status: Signature Engine (RF) failed to match known attack vectors.<br>- Conclusion: Potential novel attack or severe hardware malfunction. Escalate immediately."
 
@@ -398,8 +414,7 @@ if _GUI_AVAILABLE:
             self._jitter_lbl.setText( f"Jitter:   {vitals['jitter']:>5.2f} ns")
             self._qber_lbl.setText(   f"QBER:     {vitals['qber']:>5.2%}")
 
-            self._qber_history.append(vitals["qber"])
-            self._qber_curve.setData(list(self._qber_history))
+            self._qber_curve.setData(self._qber_history.values())
 
             self._rf_label.setText(f"RF: {rf_pred}  ({rf_conf:.1%})")
             
@@ -422,6 +437,7 @@ if _GUI_AVAILABLE:
                 self._report_area.setHtml(final_html)
 
         def closeEvent(self, event) -> None:
+            self._render_timer.stop()
             self._worker.stop()
             self._worker.wait(3000)   
             super().closeEvent(event)
@@ -7,6 +7,9 @@ The buffer holds at most `maxlen` events (default 500). When full, the
 oldest event is automatically evicted on push. Feature extraction runs
 in O(W) where W = maxlen ≈ 500, well within real-time constraints.
 
+Also provides ValueHistory, a fixed-length NumPy ring of the latest scalar
+readings (e.g. the dashboard's QBER trace).
+
 Usage:
     buf = EventBuffer(maxlen=500)
     buf.push(event_dict)
@@ -126,3 +129,41 @@ class EventBuffer:
             "timing_jitter":     float(jitters.mean()),
             "photon_count_rate": count_rate,
         }])
+
+
+class ValueHistory:
+    """
+    The latest `maxlen` scalar readings, oldest first, as a NumPy array.
+
+    Every value is written twice, at slot i and i + maxlen of a 2×maxlen
+    array, so the current window is always one contiguous slice: append()
+    is two stores and values() returns a view, with no per-update allocation.
+    """
+
+    __slots__ = ("_buf", "_maxlen", "_pos")
+
+    def __init__(self, maxlen: int, fill: float = 0.0) -> None:
+        self._maxlen: int = maxlen
+        self._buf: np.ndarray = np.full(2 * maxlen, fill, dtype=np.float64)
+        self._pos: int = 0
+
+    def append(self, value: float) -> None:
+        """Record one reading, dropping the oldest."""
+        self._buf[self._pos] = value
+        self._buf[self._pos + self._maxlen] = value
+        self._pos = (self._pos + 1) % self._maxlen
+
+    def reset(self, fill: float = 0.0) -> None:
+        """Overwrite the whole window with `fill`."""
+        self._buf.fill(fill)
+        self._pos = 0
+
+    def values(self) -> np.ndarray:
+        """
+        Read-only view of the window, oldest reading first. It shares memory
+        with the ring and is only valid until the next append()/reset();
+        copy it to keep the readings.
+        """
+        view = self._buf[self._pos:self._pos + self._maxlen]
+        view.flags.writeable = False
+        return view
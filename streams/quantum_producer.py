@@ -20,18 +20,22 @@ from config.logging_config import get_logger
 
 log = get_logger("qkd.simulation")
 
+# Polarisation label per index 2·basis + bit: H, V (rectilinear), D, A (diagonal)
+_LABELS: tuple[str, ...] = ('H', 'V', 'D', 'A')
+
 async def quantum_event_stream(
     attack_mode: str = "none",
     intensity_mode: str = "single_photon",
     noise_p: float = 0.04,
     state_controller: dict = None,
+    rng: np.random.Generator | None = None,
 ) -> "asyncio.AsyncGenerator[dict, None]":
     
+    rng = rng if rng is not None else np.random.default_rng()
     laser = hardware.LaserSource()
-    detector = hardware.APD_Detector()
+    detector = hardware.APD_Detector(rng=rng)
     detector.set_attack_mode(attack_mode)
 
-    alice_basis_choices = [0, 1]
     t: float = 0.0
 
     log.info(
@@ -52,22 +56,17 @@ async def quantum_event_stream(
 
         detector.set_attack_mode(current_attack)
 
-        alice_bit: int = int(np.random.randint(0, 2))
-        alice_basis: int = int(np.random.choice(alice_basis_choices))
+        # One draw in [0, 8): bit 0 = Alice's bit, bit 1 = her basis, bit 2 = Bob's basis
+        draw: int = int(rng.integers(0, 8, dtype=np.uint8))
+        alice_bit: int = draw & 1
+        alice_basis: int = (draw >> 1) & 1
+        bob_basis: int = draw >> 2
 
-        label_map: dict[tuple[int, int], str] = {
-            (0, 0): 'H',
-            (1, 0): 'V',
-            (0, 1): 'D',
-            (1, 1): 'A',
-        }
-        
-        q_state, flux = laser.emit(label_map[(alice_bit, alice_basis)], current_intensity)
+        q_state, flux = laser.emit(_LABELS[2 * alice_basis + alice_bit], current_intensity)
 
         if current_intensity != "blinding":
             q_state.apply_depolarizing_noise(noise_p)
 
-        bob_basis: int = int(np.random.choice(alice_basis_choices))
         basis_str: str = 'rectilinear' if bob_basis == 0 else 'diagonal'
 
         result: int | None = detector.detect(q_state, flux, basis_str, t)
@@ -75,11 +74,11 @@ async def quantum_event_stream(
         t += 1e-6
 
         if current_attack == "timeshift":
-            c_rate = float(np.random.normal(0.15, 0.02))
+            c_rate = float(rng.normal(0.15, 0.02))
         elif current_intensity == "blinding":
-            c_rate = float(np.random.normal(0.99, 0.005))
+            c_rate = float(rng.normal(0.99, 0.005))
         else:
-            c_rate = float(np.random.normal(0.25, 0.02))
+            c_rate = float(rng.normal(0.25, 0.02))
 
         if result is not None:
             yield {
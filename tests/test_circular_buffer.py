@@ -0,0 +1,48 @@
+"""
+tests/test_circular_buffer.py
+Pytest unit tests for streams/circular_buffer.py (dashboard value history).
+
+Tests verify that ValueHistory keeps the same window, in the same order,
+as a bounded deque of the latest readings.
+
+Run with:
+    conda activate qkd_env
+    pytest tests/test_circular_buffer.py -v
+"""
+import sys
+import os
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+
+from streams.circular_buffer import ValueHistory
+
+
+class TestValueHistory:
+    @pytest.mark.parametrize("n_appends", [0, 1, 7, 10, 23])
+    def test_matches_bounded_deque(self, n_appends: int) -> None:
+        """Window is the latest readings, oldest first, like deque(maxlen)."""
+        history  = ValueHistory(10)
+        expected = deque([0.0] * 10, maxlen=10)
+        for value in np.linspace(0.01, 0.3, n_appends):
+            history.append(value)
+            expected.append(value)
+        np.testing.assert_array_equal(history.values(), list(expected))
+
+    def test_reset_refills_window(self) -> None:
+        history = ValueHistory(5)
+        for value in range(8):
+            history.append(value)
+        history.reset()
+        history.append(0.5)
+        np.testing.assert_array_equal(history.values(), [0.0, 0.0, 0.0, 0.0, 0.5])
+
+    def test_values_is_read_only_view(self) -> None:
+        history = ValueHistory(4)
+        view = history.values()
+        assert view.shape == (4,)
+        with pytest.raises(ValueError):
+            view[0] = 1.0
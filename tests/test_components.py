@@ -0,0 +1,166 @@
+"""
+tests/test_components.py
+Pytest unit tests for Simulation/components.py (APD hardware model).
+
+Tests verify the vectorised detector path against the physical behaviour
+of the single-pulse detect() model: click rates per operating mode,
+telemetry signatures, and dead-time gating.
+
+Run with:
+    conda activate qkd_env
+    pytest tests/test_components.py -v
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Simulation'))
+
+import numpy as np
+import pytest
+
+import components as hardware  # type: ignore[import]
+import core_real as phys       # type: ignore[import]
+
+N_PULSES = 4000
+
+
+def _batch(attack_mode: str = "none", flux: float = 0.1, spacing: float = 15e-6):
+    """Run detect_batch on N_PULSES |H⟩ states measured in the rectilinear basis."""
+    detector = hardware.APD_Detector()
+    detector.set_attack_mode(attack_mode)
+    states = [phys.QState.from_label('H') for _ in range(N_PULSES)]
+    bases  = np.zeros(N_PULSES, dtype=np.uint8)
+    times  = np.arange(N_PULSES) * spacing
+    return detector, detector.detect_batch(states, flux, bases, times)
+
+
+class TestDetectBatch:
+    """Vectorised detection must reproduce the per-mode APD signatures."""
+
+    def test_output_shapes_and_values(self) -> None:
+        _, (outcomes, voltages, jitters) = _batch()
+        assert outcomes.shape == voltages.shape == jitters.shape == (N_PULSES,)
+        assert set(np.unique(outcomes)) <= {-1, 0, 1}
+
+    def test_normal_mode_efficiency(self) -> None:
+        """Normal Geiger mode fires on ~25% of pulses."""
+        _, (outcomes, _, _) = _batch()
+        assert np.mean(outcomes >= 0) == pytest.approx(0.25, abs=0.03)
+
+    def test_matching_basis_recovers_bit(self) -> None:
+        """|H⟩ measured rectilinearly reads 0 except for rare flips / dark counts."""
+        _, (outcomes, _, _) = _batch()
+        clicks = outcomes[outcomes >= 0]
+        assert np.mean(clicks == 0) > 0.98
+
+    def test_blinding_signature(self) -> None:
+        """Flux above saturation → every pulse clicks at ~9 V with near-zero jitter."""
+        detector, (outcomes, voltages, jitters) = _batch(flux=1e9)
+        assert np.mean(outcomes >= 0) > 0.99
+        assert voltages.mean() == pytest.approx(9.0, abs=0.05)
+        assert jitters.mean() == pytest.approx(0.1, abs=0.01)
+        assert detector.current_voltage == pytest.approx(voltages[-1])
+
+    def test_timeshift_signature(self) -> None:
+        """Time-Shift attack → ~15% count rate with ~0.05 ns jitter."""
+        _, (outcomes, _, jitters) = _batch(attack_mode="timeshift")
+        assert np.mean(outcomes >= 0) == pytest.approx(0.15, abs=0.03)
+        assert jitters.mean() == pytest.approx(0.05, abs=0.01)
+
+    def test_state_batch_matches_state_list(self) -> None:
+        """A QStateBatch register gives the same outcomes as the equivalent QState list."""
+        labels = ['H', 'V', 'D', 'A'] * (N_PULSES // 4)
+        bases  = np.tile([0, 0, 1, 1], N_PULSES // 4)
+        times  = np.arange(N_PULSES) * 15e-6
+        runs = []
+        for states in (phys.QStateBatch.from_labels(labels), [phys.QState.from_label(l) for l in labels]):
+            detector = hardware.APD_Detector(rng=np.random.default_rng(3))
+            runs.append(detector.detect_batch(states, 0.1, bases, times))
+        for a, b in zip(*runs):
+            np.testing.assert_array_equal(a, b)
+
+    def test_empty_batch(self) -> None:
+        detector = hardware.APD_Detector()
+        outcomes, voltages, jitters = detector.detect_batch([], 0.1, np.zeros(0, dtype=np.uint8), np.zeros(0))
+        assert outcomes.size == voltages.size == jitters.size == 0
+        assert detector.last_click_time == -1.0
+
+    def test_string_bases_match_detect_encoding(self) -> None:
+        """'diagonal' / 'rectilinear' select the same basis as integer codes 1 / 0."""
+        detector = hardware.APD_Detector()
+        states = [phys.QState.from_label('D') for _ in range(N_PULSES)]
+        outcomes, _, _ = detector.detect_batch(
+            states, 0.1, ['diagonal'] * N_PULSES, np.arange(N_PULSES) * 15e-6,
+        )
+        clicks = outcomes[outcomes >= 0]
+        assert np.mean(clicks == 0) > 0.98
+
+    def test_seeded_detector_is_reproducible(self) -> None:
+        runs = []
+        for _ in range(2):
+            detector = hardware.APD_Detector(rng=np.random.default_rng(9))
+            states = [phys.QState.from_label('D') for _ in range(500)]
+            runs.append(detector.detect_batch(states, 0.1, np.ones(500, dtype=np.uint8), np.arange(500) * 15e-6))
+        for a, b in zip(*runs):
+            np.testing.assert_array_equal(a, b)
+
+    def test_dead_time_spacing(self) -> None:
+        """With 1 µs pulse spacing, successive clicks must be ≥ 10 µs apart."""
+        _, (outcomes, _, _) = _batch(flux=1e9, spacing=1e-6)
+        click_times = np.flatnonzero(outcomes >= 0) * 1e-6
+        assert np.all(np.diff(click_times) >= hardware.CONSTANTS['dead_time'] - 1e-12)
+
+
+class TestEmitBatch:
+    """Batched LaserSource emission must match per-pulse emit()."""
+
+    def test_flux_per_mode(self) -> None:
+        laser = hardware.LaserSource()
+        modes = ['single_photon', 'blinding', 'unknown', 'blinding']
+        states, flux = laser.emit_batch(['H', 'V', 'D', 'A'], modes)
+        assert len(states) == 4
+        np.testing.assert_array_equal(flux, [laser.emit('H', m)[1] for m in modes])
+
+    def test_scalar_mode_broadcasts(self) -> None:
+        _, flux = hardware.LaserSource().emit_batch(['H'] * 5, 'blinding')
+        np.testing.assert_array_equal(flux, np.full(5, 1e9))
+
+
+class TestDrawPool:
+    """Pre-drawn pools used by the single-pulse detect() path."""
+
+    def test_refill_preserves_moments(self) -> None:
+        pool = hardware._DrawPool(np.random.default_rng(11).standard_normal, size=1000)
+        draws = np.array([pool.sample(3.3, 0.2) for _ in range(5000)])
+        assert draws.mean() == pytest.approx(3.3, abs=0.02)
+        assert draws.std()  == pytest.approx(0.2, abs=0.02)
+
+    def test_refill_continues_the_stream(self) -> None:
+        """Crossing a refill boundary yields the same sequence as one large draw."""
+        pool = hardware._DrawPool(np.random.default_rng(4).random, size=16)
+        draws = [pool.next() for _ in range(40)]
+        np.testing.assert_array_equal(draws, np.random.default_rng(4).random(48)[:40])
+
+
+class TestDetect:
+    """Single-pulse detect() driven by the uniform / normal pools."""
+
+    def test_normal_mode_efficiency(self) -> None:
+        detector = hardware.APD_Detector()
+        state = phys.QState.from_label('H')
+        results = [detector.detect(state, 0.1, 'rectilinear', i * 15e-6) for i in range(N_PULSES)]
+        clicks = [r for r in results if r is not None]
+        assert len(clicks) / N_PULSES == pytest.approx(0.25, abs=0.03)
+        assert np.mean(np.array(clicks) == 0) > 0.98
+
+    def test_seeded_detector_is_reproducible(self) -> None:
+        """With rng= every draw, including QState.measure, comes from one seeded stream."""
+        runs = []
+        for _ in range(2):
+            detector = hardware.APD_Detector(rng=np.random.default_rng(9))
+            runs.append([
+                (detector.detect(phys.QState.from_label('D'), 0.1, 'rectilinear', i * 15e-6),
+                 detector.current_voltage)
+                for i in range(500)
+            ])
+        assert runs[0] == runs[1]
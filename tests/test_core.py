@@ -0,0 +1,255 @@
+"""
+tests/test_core.py
+Pytest unit tests for Simulation/core.py (vectorised BB84 engine).
+
+Tests verify protocol-level invariants: noiseless sifted keys agree exactly,
+intercept-resend raises QBER to ~25%, and Born-rule measurement statistics
+are correct for each preparation/measurement basis pair.
+
+Run with:
+    conda activate qkd_env
+    pytest tests/test_core.py -v
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Simulation'))
+
+import numpy as np
+import pytest
+
+import core as bb        # type: ignore[import]
+import _bb84_kernels as kernels  # type: ignore[import]
+import manager as expt   # type: ignore[import]
+import attacker as eve   # type: ignore[import]
+import noise            # type: ignore[import]
+import runner           # type: ignore[import]
+
+N_QUBITS = 20_000
+
+
+class TestProtocol:
+    """End-to-end BB84 rounds through QKDExperiment."""
+
+    def test_noiseless_qber_is_zero(self) -> None:
+        experiment = expt.QKDExperiment(N_QUBITS)
+        assert experiment.execute() == 0.0
+        np.testing.assert_array_equal(experiment.final_key_alice, experiment.final_key_bob)
+
+    def test_sifting_keeps_about_half(self) -> None:
+        experiment = expt.QKDExperiment(N_QUBITS)
+        experiment.execute()
+        assert len(experiment.alice.key) / N_QUBITS == pytest.approx(0.5, abs=0.02)
+
+    def test_intercept_resend_qber(self) -> None:
+        """Eve measuring in a random basis introduces ~25% QBER."""
+        qber = eve.EveQKDExperiment(N_QUBITS).execute()
+        assert qber == pytest.approx(0.25, abs=0.03)
+
+    def test_fused_round_statistics(self) -> None:
+        """run_round: matching bases agree exactly, mismatched bases agree half the time."""
+        a_bits, a_bases, b_bases, b_bits, match = bb.run_round(N_QUBITS, np.random.default_rng(8))
+        assert all(arr.dtype == np.uint8 for arr in (a_bits, a_bases, b_bases, b_bits))
+        np.testing.assert_array_equal(match, a_bases == b_bases)
+        np.testing.assert_array_equal(a_bits[match], b_bits[match])
+        assert np.mean(a_bits[~match] == b_bits[~match]) == pytest.approx(0.5, abs=0.03)
+
+    def test_execute_batch_shapes(self) -> None:
+        qber, sifted = expt.execute_batch(2000, 8, np.random.default_rng(3))
+        assert qber.shape == sifted.shape == (8,)
+        np.testing.assert_array_equal(qber, 0.0)
+        assert np.all(np.abs(sifted / 2000 - 0.5) < 0.05)
+
+
+class TestMeasurement:
+    """Born-rule statistics of Bob.measure_qubits."""
+
+    def test_matching_basis_is_deterministic(self) -> None:
+        alice = bb.Alice(N_QUBITS)
+        alice.prepare_qubits()
+        bob = bb.Bob(N_QUBITS)
+        bob.measure_qubits(alice.state_matrix)
+        match = alice.bases == bob.bases
+        np.testing.assert_array_equal(alice.bits[match], bob.measured_bits[match])
+
+    def test_mismatched_basis_is_random(self) -> None:
+        alice = bb.Alice(N_QUBITS)
+        alice.prepare_qubits()
+        bob = bb.Bob(N_QUBITS)
+        bob.measure_qubits(alice.state_matrix)
+        mismatch = alice.bases != bob.bases
+        agreement = np.mean(alice.bits[mismatch] == bob.measured_bits[mismatch])
+        assert agreement == pytest.approx(0.5, abs=0.03)
+
+    def test_seeded_generator_is_reproducible(self) -> None:
+        runs = []
+        for _ in range(2):
+            alice = bb.Alice(1000, rng=np.random.default_rng(7))
+            alice.prepare_qubits()
+            runs.append((alice.bits.copy(), alice.bases.copy()))
+        np.testing.assert_array_equal(runs[0][0], runs[1][0])
+        np.testing.assert_array_equal(runs[0][1], runs[1][1])
+
+    def test_noisy_parties_use_given_generator(self) -> None:
+        runs = []
+        for _ in range(2):
+            rng   = np.random.default_rng(11)
+            alice = noise.NoisyAlice(1000, p_fail=0.3, rng=rng)
+            bob   = noise.NoisyBob(1000, p_fail=0.3, rng=rng)
+            alice.prepare_qubits()
+            bob.measure_qubits(alice.state_matrix)
+            runs.append((alice.state_matrix.copy(), bob.bases.copy(), bob.measured_bits.copy()))
+        for first, second in zip(*runs):
+            np.testing.assert_array_equal(first, second)
+
+    def test_noisy_experiment_is_reproducible(self) -> None:
+        runs = [noise.NoisyQKDExperiment(5000, p_fail=0.02, rng=np.random.default_rng(12))
+                for _ in range(2)]
+        for experiment in runs:
+            experiment.execute()
+        assert runs[0].error_rate == runs[1].error_rate
+        np.testing.assert_array_equal(runs[0].final_key_bob, runs[1].final_key_bob)
+
+    def test_noisy_channel_flips_in_place(self) -> None:
+        alice = bb.Alice(1000, rng=np.random.default_rng(13))
+        alice.prepare_qubits()
+        before = alice.state_matrix.copy()
+        out = noise.NoisyQuantumChannel(np.random.default_rng(14)).transmit(alice.state_matrix)
+        assert out is alice.state_matrix
+        flipped = np.any(before != out, axis=0)
+        assert 0.02 < flipped.mean() < 0.06
+
+    def test_noisy_experiment_reruns_on_same_parties(self) -> None:
+        experiment = noise.NoisyQKDExperiment(1000, p_fail=0.01)
+        experiment.execute()
+        alice, states = experiment.alice, experiment.alice.state_matrix
+        experiment.p_fail = 0.05
+        experiment.execute()
+        assert experiment.alice is alice and experiment.alice.state_matrix is states
+        assert experiment.alice.p_fail == experiment.bob.p_fail == 0.05
+
+    def test_repeated_shots_reuse_buffers(self) -> None:
+        alice = bb.Alice(1000)
+        bob   = bb.Bob(1000)
+        alice.prepare_qubits()
+        bob.measure_qubits(alice.state_matrix)
+        first = (alice.bits, alice.bases, bob.measured_bits)
+        alice.prepare_qubits()
+        bob.measure_qubits(alice.state_matrix)
+        for before, after in zip(first, (alice.bits, alice.bases, bob.measured_bits)):
+            assert before is after
+
+
+class TestMeasureKernel:
+    """Fused measure_born kernel against the NumPy Born-rule expression."""
+
+    def test_kernel_matches_numpy(self) -> None:
+        rng   = np.random.default_rng(21)
+        alice = bb.Alice(N_QUBITS, rng=rng)
+        alice.prepare_qubits()
+        s0, s1 = alice.state_matrix
+        bases  = rng.integers(0, 2, N_QUBITS, dtype=np.uint8)
+        u      = rng.random(N_QUBITS, dtype=np.float32)
+
+        prob_zero = np.where(bases == 1, 0.5 * (s0 + s1) * (s0 + s1), s0 * s0)
+        expected  = np.greater_equal(u, prob_zero).view(np.uint8)
+        np.testing.assert_array_equal(kernels.measure_born(s0, s1, bases, u, np.empty(N_QUBITS, dtype=np.uint8)), expected)
+
+    def test_prepare_kernel_matches_matmul(self) -> None:
+        rng   = np.random.default_rng(22)
+        bits  = rng.integers(0, 2, N_QUBITS, dtype=np.uint8)
+        bases = rng.integers(0, 2, N_QUBITS, dtype=np.uint8)
+        out   = np.empty((2, N_QUBITS), dtype=bb.AMP_DTYPE)
+        kernels.prepare_states(bits, bases, out[0], out[1])
+
+        expected = np.stack([1.0 - bits, bits.astype(float)])
+        expected[:, bases == 1] = bb.H_GATE.astype(float) @ expected[:, bases == 1]
+        np.testing.assert_allclose(out, expected, atol=1e-7)
+
+    def test_numpy_prepare_matches_kernel(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Closed-form NumPy fallback writes the same amplitudes as the kernel."""
+        alice = bb.Alice(N_QUBITS, rng=np.random.default_rng(23))
+        monkeypatch.setattr(bb, "NUMBA_AVAILABLE", False)
+        alice.prepare_qubits()
+        out = np.empty((2, N_QUBITS), dtype=bb.AMP_DTYPE)
+        kernels.prepare_states(alice.bits, alice.bases, out[0], out[1])
+        np.testing.assert_allclose(alice.state_matrix, out, atol=1e-7)
+
+    def test_noisy_kernel_matches_numpy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        alice = bb.Alice(N_QUBITS, rng=np.random.default_rng(24))
+        alice.prepare_qubits()
+        outcomes = []
+        for jit in (True, False):
+            monkeypatch.setattr(noise, "NUMBA_AVAILABLE", jit)
+            bob = noise.NoisyBob(N_QUBITS, p_fail=0.3, rng=np.random.default_rng(25))
+            bob.measure_qubits(alice.state_matrix)
+            outcomes.append(bob.measured_bits.copy())
+        np.testing.assert_array_equal(outcomes[0], outcomes[1])
+
+    def test_batch_kernel_is_per_seed(self) -> None:
+        """A run's result depends only on its own seed, not its position in the batch."""
+        qber, sifted = kernels.batch_rounds(2000, np.array([4, 9, 4], dtype=np.int64))
+        np.testing.assert_array_equal(qber, 0.0)
+        assert sifted[0] == sifted[2]
+        assert np.all(np.abs(sifted / 2000 - 0.5) < 0.05)
+
+
+class TestErrorRate:
+    """ClassicalChannel.calc_error_rate on hand-built keys."""
+
+    def test_empty_key(self) -> None:
+        assert bb.ClassicalChannel.calc_error_rate(np.array([]), np.array([])) == 0.0
+
+    def test_known_error_count(self) -> None:
+        key_a = np.array([0, 1, 1, 0, 1, 0, 0, 1, 1, 1])
+        key_b = np.array([0, 1, 0, 0, 1, 1, 0, 1, 1, 0])
+        assert bb.ClassicalChannel.calc_error_rate(key_a, key_b) == pytest.approx(0.3)
+
+    @pytest.mark.parametrize("n_bits", [5, 64, 1001, 8 * 64 + 3])
+    def test_packed_matches_unpacked(self, n_bits: int) -> None:
+        """Word-sized body and byte-sized tail together count every error once."""
+        rng   = np.random.default_rng(3)
+        key_a = rng.integers(0, 2, n_bits, dtype=np.uint8)
+        key_b = key_a ^ (rng.random(n_bits) < 0.1).astype(np.uint8)
+        packed = bb.ClassicalChannel.calc_packed_error_rate(
+            np.packbits(key_a), np.packbits(key_b), len(key_a),
+        )
+        assert packed == pytest.approx(bb.ClassicalChannel.calc_error_rate(key_a, key_b))
+
+
+class TestRunner:
+    """Seeded parallel shots through Simulation/runner.py."""
+
+    def test_seeded_shot_is_reproducible(self) -> None:
+        assert runner.run_one(5, 2000, "intercept") == runner.run_one(5, 2000, "intercept")
+
+    def test_pool_matches_sequential(self) -> None:
+        seeds = [1, 2, 3]
+        expected = [runner.run_one(s, 2000, "intercept") for s in seeds]
+        assert runner.run_many(seeds, 2000, "intercept", max_workers=2) == expected
+
+    def test_noisy_sweep_forwards_params(self) -> None:
+        children = np.random.SeedSequence(7).spawn(2)
+        expected = [runner.run_one(child, 2000, "noisy", p_fail=0.05) for child in children]
+        assert runner.sweep(2000, 2, "noisy", max_workers=2, seed=7, p_fail=0.05) == expected
+
+    def test_sweep_is_reproducible_from_root_seed(self) -> None:
+        children = np.random.SeedSequence(42).spawn(3)
+        expected = [runner.run_one(child, 2000, "intercept") for child in children]
+        assert runner.sweep(2000, 3, "intercept", max_workers=2, seed=42) == expected
+
+
+class TestDtypeContract:
+    """All 0/1-valued per-qubit arrays are uint8."""
+
+    def test_protocol_arrays_are_uint8(self) -> None:
+        experiments = (
+            expt.QKDExperiment(1000),
+            eve.EveQKDExperiment(1000),
+            noise.NoisyQKDExperiment(1000, p_fail=0.02),
+        )
+        for experiment in experiments:
+            experiment.execute()
+            for arr in (experiment.alice.bits, experiment.alice.bases, experiment.alice.key,
+                        experiment.bob.bases, experiment.bob.measured_bits, experiment.bob.key):
+                assert arr.dtype == np.uint8
@@ -74,6 +74,12 @@ class TestDepolarizingNoise:
         q.apply_depolarizing_noise(p=1.0)
         assert q.get_entropy() == pytest.approx(1.0, abs=1e-6)
 
+    def test_entropy_matches_eigendecomposition(self) -> None:
+        """Closed-form 2×2 entropy agrees with −Σ λ log₂ λ over eigvalsh."""
+        q = QState(np.array([[0.7, 0.2 - 0.1j], [0.2 + 0.1j, 0.3]]))
+        evals = np.linalg.eigvalsh(q.rho)
+        assert q.get_entropy() == pytest.approx(float(-np.sum(evals * np.log2(evals))), abs=1e-12)
+
     def test_entropy_monotone_with_noise(self) -> None:
         """Entropy must increase monotonically as depolarizing strength grows."""
         entropies = []
@@ -134,3 +140,74 @@ class TestMeasurement:
         q = QState.from_label('H')
         with pytest.raises(ValueError, match="Unknown basis"):
             q.measure('circular')
+
+
+class TestQStateBatch:
+    """Batched Bloch-vector register must agree with per-state QState."""
+
+    def test_probabilities_match_density_matrices(self) -> None:
+        labels   = ['H', 'V', 'D', 'A'] * 3
+        diagonal = np.array([False, True, False] * 4)
+        batch    = phys.QStateBatch.from_labels(labels)
+        states   = [QState.from_label(label) for label in labels]
+        batch.apply_depolarizing_noise(0.2)
+        for q in states:
+            q.apply_depolarizing_noise(0.2)
+        np.testing.assert_allclose(
+            batch.probabilities(diagonal), phys.born_probabilities(states, diagonal), atol=1e-12,
+        )
+
+    def test_gates_match_unitary_evolution(self) -> None:
+        for gate, U in (('X', phys.X), ('Y', phys.Y), ('Z', phys.Z), ('H', phys.H)):
+            for label in ('H', 'V', 'D', 'A'):
+                batch = phys.QStateBatch.from_labels([label])
+                batch.apply_unitary(gate)
+                q = QState.from_label(label)
+                q.apply_unitary(U)
+                for diagonal in (False, True):
+                    mask = np.array([diagonal])
+                    assert batch.probabilities(mask)[0] == pytest.approx(
+                        phys.born_probabilities([q], mask)[0], abs=1e-12
+                    ), f"gate {gate} on {label}"
+
+    def test_matching_basis_measurement_is_deterministic(self) -> None:
+        batch    = phys.QStateBatch.from_labels(['H', 'V', 'D', 'A'] * 250)
+        diagonal = np.tile([False, False, True, True], 250)
+        results  = batch.measure(diagonal, np.random.default_rng(0))
+        np.testing.assert_array_equal(results, np.tile([0, 1, 0, 1], 250))
+
+    def test_collapse_is_repeatable(self) -> None:
+        """A second measurement in the same basis returns the first outcome."""
+        batch    = phys.QStateBatch.from_labels(['D'] * 1000)
+        diagonal = np.zeros(1000, dtype=bool)
+        first    = batch.measure(diagonal, np.random.default_rng(1))
+        assert first.mean() == pytest.approx(0.5, abs=0.06)
+        np.testing.assert_array_equal(batch.measure(diagonal, np.random.default_rng(2)), first)
+
+    def test_unknown_label_raises(self) -> None:
+        with pytest.raises(ValueError, match="Unknown label"):
+            phys.QStateBatch.from_labels(['H', 'X'])
+
+    def test_entropy_matches_qstate(self) -> None:
+        ps     = np.linspace(0.0, 1.0, 11)
+        batch  = phys.QStateBatch.from_labels(['D'] * len(ps))
+        for comp in (batch.rx, batch.ry, batch.rz):
+            comp *= 1.0 - ps
+        expected = []
+        for p in ps:
+            q = QState.from_label('D')
+            q.apply_depolarizing_noise(p)
+            expected.append(q.get_entropy())
+        np.testing.assert_allclose(batch.get_entropy(), expected, atol=1e-9)
+
+    def test_fidelity_matches_qstate(self) -> None:
+        labels = ['H', 'V', 'D', 'A']
+        batch  = phys.QStateBatch.from_labels(labels)
+        batch.apply_depolarizing_noise(0.3)
+        for target in labels:
+            expected = []
+            for label in labels:
+                q = QState.from_label(label)
+                q.apply_depolarizing_noise(0.3)
+                expected.append(q.get_fidelity(target))
+            np.testing.assert_allclose(batch.get_fidelity(target), expected, atol=1e-12)
@@ -120,6 +120,16 @@ class TestQBERValues:
         for col in ("qber_overall", "qber_rectilinear", "qber_diagonal"):
             assert result[col].between(0.0, 1.0).all(), f"Out-of-range values in '{col}'"
 
+    def test_qber_float32_keeps_window_ratios(self) -> None:
+        """float32 QBER rounds to the same k/m ratio as exact division."""
+        df     = _make_df(n=3000, error_rate=0.15)
+        result = calculate_v3_features(df, window_size=500)
+        qber   = result["qber_overall"].to_numpy()[499:]
+        assert qber.dtype == np.float32
+        sifted = df["basis_match"].rolling(500).sum().to_numpy()[499:]
+        errors = np.round(qber.astype(np.float64) * sifted)
+        np.testing.assert_allclose(errors / sifted, qber, rtol=1e-6)
+
 
 # ----------------------------------------------------------------
 # Tests: Data Quality
@@ -146,3 +156,61 @@ class TestDataQuality:
         assert (result["detector_voltage"] == 9.0).all()
         assert (result["timing_jitter"]    == 0.05).all()
         assert (result["photon_count_rate"] == 0.99).all()
+
+
+# ----------------------------------------------------------------
+# Tests: Compiled Rolling Kernel
+# ----------------------------------------------------------------
+
+class TestRollingKernel:
+    @pytest.mark.parametrize("window_size", [1, 7, 100, 2000])
+    def test_kernel_matches_pandas_rolling(self, monkeypatch: pytest.MonkeyPatch, window_size: int) -> None:
+        """Fused one-pass kernel reproduces the pandas rolling path exactly."""
+        import data_preprocessing
+        df       = _make_df(n=1500, error_rate=0.2)
+        compiled = calculate_v3_features(df.copy(), window_size=window_size)
+        monkeypatch.setattr(data_preprocessing, "NUMBA_AVAILABLE", False)
+        rolling  = calculate_v3_features(df.copy(), window_size=window_size)
+        pd.testing.assert_frame_equal(compiled, rolling)
+
+
+# ----------------------------------------------------------------
+# Tests: CSV Output
+# ----------------------------------------------------------------
+
+class TestCsvOutput:
+    def test_write_csv_round_trip(self, tmp_path) -> None:
+        """Feature frame survives write_csv -> read_csv with no index column."""
+        from utils.csv_io import write_csv
+        result = calculate_v3_features(_make_df(n=200), window_size=50)
+        path   = tmp_path / "features.csv"
+        write_csv(result, str(path))
+        loaded = pd.read_csv(path)
+        assert list(loaded.columns) == list(result.columns)
+        np.testing.assert_allclose(loaded['qber_overall'], result['qber_overall'])
+
+    def test_read_csv_narrow_flags(self, tmp_path) -> None:
+        """Raw flags load as uint8 and give the same features as int64 flags."""
+        from data_preprocessing import RAW_DTYPES
+        from utils.csv_io import read_csv, write_csv
+        df   = _make_df(n=300, error_rate=0.1)
+        path = tmp_path / "raw.csv"
+        write_csv(df, str(path))
+        loaded = read_csv(str(path), RAW_DTYPES)
+        assert loaded['basis_match'].dtype == np.uint8
+        assert loaded['detector_voltage'].dtype == np.float64
+        pd.testing.assert_frame_equal(
+            calculate_v3_features(loaded, window_size=50).reset_index(drop=True),
+            calculate_v3_features(pd.read_csv(path), window_size=50).reset_index(drop=True),
+        )
+
+    def test_read_csv_projects_columns(self, tmp_path) -> None:
+        """Only the requested feature columns are loaded, in the given order."""
+        from utils.csv_io import read_csv, write_csv
+        result = calculate_v3_features(_make_df(n=200), window_size=50)
+        path   = tmp_path / "features.csv"
+        write_csv(result, str(path))
+        columns = ['timing_jitter', 'qber_overall']
+        loaded  = read_csv(str(path), columns=columns)
+        assert list(loaded.columns) == columns
+        np.testing.assert_allclose(loaded['qber_overall'], result['qber_overall'])
@@ -0,0 +1,47 @@
+"""
+utils/csv_io.py
+CSV input/output for the dataset pipeline.
+Uses PyArrow's multithreaded C++ CSV reader/writer when PyArrow is installed
+and falls back to pandas otherwise; callers can branch on PYARROW_AVAILABLE.
+"""
+__author__ = "Rahul Rajesh 2360445"
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write `df` to `path` as CSV with a header row and no index column."""
+    if PYARROW_AVAILABLE:
+        pcsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_csv(
+    path: str,
+    dtypes: dict[str, str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Read a CSV into a DataFrame, parsing the columns named in `dtypes`
+    straight into those NumPy dtypes (e.g. 'uint8' for 0/1 flags).
+    Unlisted columns keep the parser's inferred type. If `columns` is
+    given, only those columns are parsed, in that order.
+    """
+    if not PYARROW_AVAILABLE:
+        df = pd.read_csv(path, dtype=dtypes, usecols=columns)
+        return df if columns is None else df[columns]
+
+    column_types = {
+        col: pa.from_numpy_dtype(np.dtype(dt)) for col, dt in (dtypes or {}).items()
+    }
+    convert_options = pcsv.ConvertOptions(column_types=column_types, include_columns=columns)
+    return pcsv.read_csv(path, convert_options=convert_options).to_pandas()